@@ -12,12 +12,19 @@ class Settings(BaseSettings):
     JOBS_ENABLED: bool = True
     JOB_RETENTION_DAYS: int = 30
     JOB_WARMUP_ON_START: bool = True
+    # HMAC key for login session cookies; when empty a random per-process key is used
+    # (sessions then end on restart).
+    SESSION_SECRET: str = ""
+    # Re-check template files for edits on each render (dev). The Docker image turns this off:
+    # its templates never change, so compiled templates are kept for the process lifetime.
+    TEMPLATE_AUTO_RELOAD: bool = True
 
     # Optional LLM (for Insight generation)
     INSIGHT_LLM_PROVIDER: str = "openai"  # openai|gemini|none
     INSIGHT_LLM_MODEL: str = "gpt-4o-mini"
     OPENAI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
+    INSIGHT_LLM_CONCURRENCY: int = 4  # parallel LLM calls per insight job run
 
     # SQLAlchemy URL, e.g. postgresql+psycopg://user:pass@db:5432/dbname
     DATABASE_URL: str = "postgresql+psycopg://gta:gta@db:5432/gta"
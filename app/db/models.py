@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import BIGINT, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BIGINT, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -123,6 +123,11 @@ class JobRun(Base):
     )
 
 
+# Mirrors init_db.sql. Serves list_recent_job_runs' ORDER BY started_at DESC LIMIT n
+# (as a backward index scan) and the retention cleanup's started_at cutoff.
+Index("idx_job_runs_started_at", JobRun.started_at)
+
+
 class WidgetSnapshot(Base):
     __tablename__ = "widget_snapshots"
 
@@ -157,6 +162,16 @@ class WidgetSnapshot(Base):
     )
 
 
+# Mirrors init_db.sql (schema source of truth). Serves get_latest_snapshot's
+# (widget_key, scope) ORDER BY fetched_at DESC LIMIT 1 as a single index seek.
+Index(
+    "idx_widget_snapshots_lookup",
+    WidgetSnapshot.widget_key,
+    WidgetSnapshot.scope,
+    WidgetSnapshot.fetched_at.desc(),
+)
+
+
 class PublicContext(Base):
     __tablename__ = "public_contexts"
 
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import json
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# JSONB columns are re-parsed by Postgres, so bind them as compact UTF-8 text: no padding
+# after separators and no \uXXXX escaping of non-ASCII, which shrinks multi-KB payloads.
+_JSONB_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# Hot snapshot/job lookups use bound parameters only, so compiled statements are reused
+# from SQLAlchemy's cache; size it explicitly rather than relying on the library default.
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+    json_serializer=_JSONB_ENCODER.encode,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -0,0 +1,194 @@
+"""Keep-alive HTTP(S) connections for repeated calls to the same host.
+
+urllib.request.urlopen() sends ``Connection: close`` and opens a new TCP + TLS
+connection for every request. For hosts we call many times per job run (the LLM
+APIs) that handshake is a large share of each call, so this module keeps a small
+pool of idle http.client connections per (scheme, host, port) and reuses them.
+
+urlopen() here is a drop-in for the urllib call sites: it takes a
+urllib.request.Request, returns a response usable as a context manager with
+``status``/``getcode()``/``headers``/``read()``, and raises urllib.error.HTTPError
+for 4xx/5xx. Redirects are handed to urllib to follow (they are rare for the
+hosts we call), and when a proxy is configured for the host it defers to urllib
+so proxy settings keep working. Responses are requested gzip-compressed unless the
+caller sets its own Accept-Encoding, and read() returns the decoded body.
+
+conditional_headers() and urlopen_unless_not_modified() are the shared conditional-GET
+helpers for scrapers that cache a page and revalidate it once the cache entry expires.
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import ssl
+import threading
+import zlib
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass
+from urllib.request import urlopen as _urllib_urlopen
+
+_MAX_IDLE_PER_HOST = 8
+_SSL_CONTEXT = ssl.create_default_context()
+
+_IDLE: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+_IDLE_LOCK = threading.Lock()
+
+# Errors that mean a reused idle connection was closed by the server before it
+# answered; the request is retried once on a fresh connection.
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def _uses_proxy(scheme: str, host: str) -> bool:
+    return scheme in getproxies() and not proxy_bypass(host)
+
+
+def _acquire(key: tuple[str, str, int], timeout: float) -> http.client.HTTPConnection:
+    with _IDLE_LOCK:
+        idle = _IDLE.get(key)
+        conn = idle.pop() if idle else None
+    if conn is None:
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=_SSL_CONTEXT)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _release(key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+    with _IDLE_LOCK:
+        idle = _IDLE.setdefault(key, [])
+        if len(idle) < _MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+class PooledResponse:
+    """Wraps an http.client response; closing it hands the connection back to the pool."""
+
+    def __init__(
+        self,
+        key: tuple[str, str, int],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+        *,
+        gunzip: bool = False,
+    ):
+        self._key = key
+        self._conn: http.client.HTTPConnection | None = conn
+        self._resp = resp
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gunzip else None
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    def read(self, amt: int | None = None) -> bytes:
+        if self._decoder is None:
+            return self._resp.read(amt)
+        if amt is None:
+            return self._decoder.decompress(self._resp.read()) + self._decoder.flush()
+        # Keep reading until compressed input yields output, so b"" still means end of body.
+        while True:
+            data = self._resp.read(amt)
+            if not data:
+                return self._decoder.flush()
+            out = self._decoder.decompress(data)
+            if out:
+                return out
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        # Only a fully read response leaves the connection ready for the next request.
+        if self._resp.isclosed():
+            _release(self._key, conn)
+        else:
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self) -> PooledResponse:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def urlopen(req: Request, *, timeout: float) -> Any:
+    parts = urlsplit(req.full_url)
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if scheme not in {"http", "https"} or not host or _uses_proxy(scheme, host):
+        return _urllib_urlopen(req, timeout=timeout)
+
+    key = (scheme, host, parts.port or (443 if scheme == "https" else 80))
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = dict(req.header_items())
+    # Scraped pages and JSON bodies compress several-fold; only decode what we asked for.
+    want_gzip = not any(name.lower() == "accept-encoding" for name in headers)
+    if want_gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    conn = _acquire(key, timeout)
+    reused = conn.sock is not None
+    try:
+        try:
+            conn.request(req.get_method(), path, body=req.data, headers=headers)
+            resp = conn.getresponse()
+        except _STALE_ERRORS:
+            if not reused:
+                raise
+            conn.close()
+            conn.request(req.get_method(), path, body=req.data, headers=headers)
+            resp = conn.getresponse()
+    except BaseException:
+        conn.close()
+        raise
+
+    gunzip = want_gzip and (resp.headers.get("Content-Encoding") or "").strip().lower() == "gzip"
+    pooled = PooledResponse(key, conn, resp, gunzip=gunzip)
+    if 300 <= resp.status < 400 and resp.headers.get("Location"):
+        pooled.read()
+        pooled.close()
+        return _urllib_urlopen(req, timeout=timeout)
+    if resp.status >= 400:
+        body = pooled.read()
+        pooled.close()
+        raise HTTPError(req.full_url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+    return pooled
+
+
+def conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for revalidating a previously fetched copy."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def urlopen_unless_not_modified(req: Request, *, timeout: float) -> tuple[bytes, str | None, str | None] | None:
+    """Return (body, etag, last_modified), or None when the server answers 304 Not Modified."""
+    try:
+        with urlopen(req, timeout=timeout) as resp:
+            body = resp.read()
+            if resp.status == 304:
+                return None
+            return body, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    except HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
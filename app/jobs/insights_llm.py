@@ -10,16 +10,27 @@ from datetime import datetime
 from typing import Any
 from urllib.error import HTTPError
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from app.config import settings
+from app.http_pool import urlopen
 
 logger = logging.getLogger(__name__)
 
 
+# json.dumps() builds a fresh JSONEncoder whenever non-default options are passed;
+# prompts, digests and request logs all use the same options, so share one.
+_STABLE_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, default=str)
+
+
+def stable_json_dumps(obj: Any) -> str:
+    """Sorted-key, non-ASCII-preserving JSON used for prompts, digests and logs."""
+    return _STABLE_ENCODER.encode(obj)
+
+
 def _json_dump(obj: Any) -> str:
     try:
-        return json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str)
+        return stable_json_dumps(obj)
     except Exception:
         return str(obj)
 
@@ -127,7 +138,7 @@ def _extract_json_object(text: str) -> dict:
 
 
 def digest_for_inputs(obj: Any) -> str:
-    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    raw = stable_json_dumps(obj).encode("utf-8")
     return hashlib.sha256(raw).hexdigest()
 
 
@@ -5,11 +5,13 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from sqlalchemy.orm import Session
 
 from app.db.models import PublicContext
+# Context URLs are mostly on a handful of hosts (data.worldbank.org); reuse keep-alive connections.
+from app.http_pool import urlopen
 
 
 def _now_utc() -> datetime:
@@ -57,6 +59,26 @@ def fetch_url_excerpt(url: str, *, timeout_seconds: int = 20, max_chars: int = 1
         return FetchResult(ok=False, url=url, title="", excerpt="", fetched_at=_now_utc(), error=str(e))
 
 
+def _is_fresh(row: PublicContext | None, ttl_minutes: int) -> bool:
+    return bool(row and row.fetched_at and row.fetched_at > (_now_utc() - timedelta(minutes=ttl_minutes)))
+
+
+def _refresh_context(db: Session, url: str) -> PublicContext:
+    fr = fetch_url_excerpt(url)
+    row = PublicContext(
+        url=url,
+        title=fr.title,
+        excerpt=fr.excerpt,
+        ok=bool(fr.ok),
+        error=fr.error or "",
+        fetched_at=fr.fetched_at,
+    )
+    db.add(row)
+    db.flush()
+    # The flushed instance is the newest row for this URL; no need to read it back.
+    return row
+
+
 def get_or_refresh_context(
     db: Session,
     *,
@@ -75,30 +97,35 @@ def get_or_refresh_context(
         .first()
     )
 
-    if row and row.fetched_at and row.fetched_at > (_now_utc() - timedelta(minutes=ttl_minutes)):
-        return row
+    if _is_fresh(row, ttl_minutes):
+        return row  # type: ignore[return-value]
+    return _refresh_context(db, url)
 
-    fr = fetch_url_excerpt(url)
-    db.add(
-        PublicContext(
-            url=url,
-            title=fr.title,
-            excerpt=fr.excerpt,
-            ok=bool(fr.ok),
-            error=fr.error or "",
-            fetched_at=fr.fetched_at,
-        )
-    )
-    db.flush()
 
-    # Return the newly inserted one
-    new_row: PublicContext | None = (
+def get_or_refresh_contexts(
+    db: Session,
+    urls: list[str],
+    *,
+    ttl_minutes: int = 360,
+) -> dict[str, PublicContext]:
+    """Like get_or_refresh_context() for several URLs: one query for the cached rows,
+    then an upstream fetch only for URLs that are missing or expired."""
+    if not urls:
+        return {}
+    rows = (
         db.query(PublicContext)
-        .filter(PublicContext.url == url)
-        .order_by(PublicContext.fetched_at.desc())
-        .first()
+        .filter(PublicContext.url.in_(urls))
+        .distinct(PublicContext.url)
+        .order_by(PublicContext.url, PublicContext.fetched_at.desc())
+        .all()
     )
-    return new_row or row  # type: ignore[return-value]
+    out: dict[str, PublicContext] = {}
+    for row in rows:
+        out.setdefault(row.url, row)
+    for url in urls:
+        if not _is_fresh(out.get(url), ttl_minutes):
+            out[url] = _refresh_context(db, url)
+    return out
 
 
 def to_prompt_block(row: PublicContext) -> dict[str, Any]:
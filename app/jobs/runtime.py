@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import desc, func
+from sqlalchemy import Integer, Row, bindparam, delete, desc, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.db.models import GeoDictionary, InsightGenerateLog, JobDefinition, JobRun, WidgetInsight, WidgetSnapshot
+from app.db.models import (
+    GeoDictionary,
+    InsightGenerateLog,
+    JobDefinition,
+    JobRun,
+    WidgetInsight,
+    WidgetInsightJobState,
+    WidgetSnapshot,
+)
 from app.db.session import SessionLocal
 from app.web import widget_data
 from app.web.imaa import fetch_ma_by_country, fetch_ma_by_industry
@@ -79,8 +92,8 @@ def get_geo_to_wdi(db: Session | None = None) -> dict[str, str]:
 # Backward-compatible module-level references (lazy, read on first access)
 ALLOWED_GEOS = _FALLBACK_GEOS
 GEO_TO_WDI = _FALLBACK_GEO_TO_WDI
-ALLOWED_INSIGHT_CARD_KEYS = {"trade_flow", "wealth", "finance", "executive"}
-ALLOWED_INSIGHT_TAB_KEYS = {
+ALLOWED_INSIGHT_CARD_KEYS: frozenset[str] = frozenset({"trade_flow", "wealth", "finance", "executive"})
+ALLOWED_INSIGHT_TAB_KEYS: frozenset[str] = frozenset({
     "corridors",
     "wci",
     "portwatch",
@@ -94,10 +107,10 @@ ALLOWED_INSIGHT_TAB_KEYS = {
     "industry",
     "country",
     "summary",
-}
+})
 
-RUNNABLE_STATUSES = {"success", "failed", "skipped"}
-JOB_RUN_BY = {"scheduler", "manual", "startup", "api"}
+RUNNABLE_STATUSES: frozenset[str] = frozenset({"success", "failed", "skipped"})
+JOB_RUN_BY: frozenset[str] = frozenset({"scheduler", "manual", "startup", "api"})
 DEFAULT_CRON_EVERY_10_MIN = "*/10 * * * *"
 LEGACY_CRON_BY_JOB = {
     "trade_corridors": "0 */6 * * *",
@@ -109,9 +122,16 @@ LEGACY_CRON_BY_JOB = {
     "cleanup_snapshots": "0 4 * * *",
 }
 
-_SCHEDULER: BackgroundScheduler | None = None
-_LOCKS: dict[str, threading.Lock] = {}
-_SCHED_LOCK = threading.Lock()
+_SCHEDULER: AsyncIOScheduler | None = None
+_SCHED_LOCK = threading.Lock()  # guards _SCHEDULER only; never taken on the run path
+_SEED_LOCK = threading.Lock()
+# job_id -> (cron_expr, timezone) currently registered with the scheduler.
+_JOB_STATE: dict[str, tuple[str, str]] = {}
+_RELOAD_LOCK = threading.Lock()
+_SEEDED = False
+# Bumped after every job run commits; web readers key derived caches on it.
+_DATA_VERSION = 0
+_DATA_VERSION_LOCK = threading.Lock()
 
 
 def _now_utc() -> datetime:
@@ -146,6 +166,12 @@ def _as_int(value: Any, default: int, min_value: int, max_value: int) -> int:
     return iv
 
 
+@functools.lru_cache(maxsize=8)
+def _canonical_geo_map(allowed: tuple[str, ...]) -> dict[str, str]:
+    # Keyed by the enabled geo list so DB edits are picked up; callers must not mutate the result.
+    return {g.lower(): g for g in allowed}
+
+
 def _as_geo_list(value: Any, db: Session | None = None) -> list[str]:
     allowed = get_allowed_geos(db)
     if value is None:
@@ -158,7 +184,7 @@ def _as_geo_list(value: Any, db: Session | None = None) -> list[str]:
     else:
         return list(allowed)
 
-    canonical_map = {g.lower(): g for g in allowed}
+    canonical_map = _canonical_geo_map(tuple(allowed))
     out: list[str] = []
     for raw in items:
         key = raw.lower()
@@ -174,38 +200,52 @@ def _canonical_scope(value: Any, db: Session | None = None) -> str | None:
     s = str(value or "").strip()
     if not s:
         return None
-    allowed = get_allowed_geos(db)
-    canonical_map = {g.lower(): g for g in allowed}
-    return canonical_map.get(s.lower())
+    return _canonical_geo_map(tuple(get_allowed_geos(db))).get(s.lower())
 
 
-def _normalize_scope_list(value: Any) -> list[str]:
+def _normalize_scope_list(value: Any, db: Session | None = None) -> list[str]:
     if value is None or value == "":
         return []
     if isinstance(value, list):
         items = value
     else:
         items = [value]
+    # Resolve the enabled geos once rather than once per item.
+    canonical_map = _canonical_geo_map(tuple(get_allowed_geos(db)))
     out: list[str] = []
     for item in items:
-        scope = _canonical_scope(item)
+        scope = canonical_map.get(str(item or "").strip().lower())
         if scope and scope not in out:
             out.append(scope)
     return out
 
 
-def _parse_json_object(raw: str | None, fallback: dict[str, Any] | None = None) -> dict[str, Any]:
-    if raw is None or raw.strip() == "":
-        return fallback or {}
+def _loads_json_object(raw: str) -> dict[str, Any] | None:
+    # Only JSON objects are accepted; reject anything else without running the decoder.
+    if not raw.lstrip().startswith("{"):
+        return None
     try:
         data = json.loads(raw)
     except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _parse_json_object(raw: str | None, fallback: dict[str, Any] | None = None) -> dict[str, Any]:
+    if raw is None or raw.strip() == "":
         return fallback or {}
-    if not isinstance(data, dict):
+    data = _loads_json_object(raw)
+    if data is None:
         return fallback or {}
     return data
 
 
+@functools.lru_cache(maxsize=1024)
+def _loads_params_cached(raw: str) -> dict[str, Any] | None:
+    # Cached value is shared; parse_params_json hands out copies.
+    return _loads_json_object(raw)
+
+
 def _record_snapshot(
     db: Session,
     *,
@@ -217,20 +257,35 @@ def _record_snapshot(
     job_run_id: int | None,
     source_updated_at: datetime | None = None,
     source_updated_at_note: str = "",
+    batch: list[dict[str, Any]] | None = None,
+    fetched_at: datetime | None = None,
 ) -> None:
-    db.add(
-        WidgetSnapshot(
-            widget_key=widget_key,
-            scope=scope,
-            payload=payload,
-            source=source,
-            is_stale=is_stale,
-            fetched_at=_now_utc(),
-            source_updated_at=source_updated_at,
-            source_updated_at_note=source_updated_at_note or "",
-            job_run_id=job_run_id,
-        )
-    )
+    """Add one snapshot, or append it to ``batch`` for a later _record_snapshots_bulk().
+
+    Batched runners pass one ``fetched_at`` for the whole batch so all rows of a run
+    share the same timestamp.
+    """
+    row = {
+        "widget_key": widget_key,
+        "scope": scope,
+        "payload": payload,
+        "source": source,
+        "is_stale": is_stale,
+        "fetched_at": fetched_at or _now_utc(),
+        "source_updated_at": source_updated_at,
+        "source_updated_at_note": source_updated_at_note or "",
+        "job_run_id": job_run_id,
+    }
+    if batch is not None:
+        batch.append(row)
+        return
+    db.add(WidgetSnapshot(**row))
+
+
+def _record_snapshots_bulk(db: Session, rows: list[dict[str, Any]]) -> None:
+    # One executemany INSERT; skips ORM instance construction and per-object flush bookkeeping.
+    if rows:
+        db.execute(insert(WidgetSnapshot), rows)
 
 
 @dataclass(frozen=True)
@@ -241,83 +296,73 @@ class JobSpec:
     cron_expr: str
     timezone: str
     default_params: dict[str, Any]
-    normalize_params: Callable[[dict[str, Any]], dict[str, Any]]
+    # Called with the caller's session (or None) so geo validation reuses its connection.
+    normalize_params: Callable[[dict[str, Any], Session | None], dict[str, Any]]
     runner: Callable[[Session, dict[str, Any], int | None], str]
 
 
-def _normalize_trade_corridors(raw: dict[str, Any]) -> dict[str, Any]:
+def _normalize_trade_corridors(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
     return {"force_wci": _as_bool(raw.get("force_wci"), False)}
 
 
-def _normalize_trade_exim(raw: dict[str, Any]) -> dict[str, Any]:
-    end_year = raw.get("end_year")
+def _normalize_end_year(end_year: Any) -> int:
+    now_year = _now_utc().year
     if end_year is None:
-        normalized_end_year = _now_utc().year - 1
-    else:
-        normalized_end_year = _as_int(end_year, _now_utc().year - 1, 1960, _now_utc().year)
-    return {
-        "geo_list": _as_geo_list(raw.get("geo_list")),
-        "years": _as_int(raw.get("years"), 5, 2, 20),
-        "end_year": normalized_end_year,
-        "force": _as_bool(raw.get("force"), False),
-    }
+        return now_year - 1
+    return _as_int(end_year, now_year - 1, 1960, now_year)
 
 
-def _normalize_wealth_indicators(raw: dict[str, Any]) -> dict[str, Any]:
-    end_year = raw.get("end_year")
-    if end_year is None:
-        normalized_end_year = _now_utc().year - 1
-    else:
-        normalized_end_year = _as_int(end_year, _now_utc().year - 1, 1960, _now_utc().year)
-    return {
-        "geo_list": _as_geo_list(raw.get("geo_list")),
-        "years": _as_int(raw.get("years"), 5, 2, 20),
-        "end_year": normalized_end_year,
-        "force": _as_bool(raw.get("force"), False),
-    }
+# Field parsers shared by the per-geo World Bank jobs; each job lists the fields it takes.
+_PARAM_FIELDS: dict[str, Callable[[dict[str, Any], Session | None], Any]] = {
+    "geo_list": lambda raw, db: _as_geo_list(raw.get("geo_list"), db=db),
+    "years": lambda raw, db: _as_int(raw.get("years"), 5, 2, 20),
+    "end_year": lambda raw, db: _normalize_end_year(raw.get("end_year")),
+    "lookback_years": lambda raw, db: _as_int(raw.get("lookback_years"), 20, 5, 60),
+    "force": lambda raw, db: _as_bool(raw.get("force"), False),
+}
 
 
-def _normalize_wealth_disposable(raw: dict[str, Any]) -> dict[str, Any]:
-    return {"force": _as_bool(raw.get("force"), False)}
+def _normalize_fields(fields: tuple[str, ...], raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
+    return {name: _PARAM_FIELDS[name](raw, db) for name in fields}
 
 
-def _normalize_wealth_age_structure(raw: dict[str, Any]) -> dict[str, Any]:
-    end_year = raw.get("end_year")
-    if end_year is None:
-        normalized_end_year = _now_utc().year - 1
-    else:
-        normalized_end_year = _as_int(end_year, _now_utc().year - 1, 1960, _now_utc().year)
-    return {
-        "geo_list": _as_geo_list(raw.get("geo_list")),
-        "end_year": normalized_end_year,
-        "lookback_years": _as_int(raw.get("lookback_years"), 20, 5, 60),
-        "force": _as_bool(raw.get("force"), False),
-    }
+_normalize_trade_exim = functools.partial(_normalize_fields, ("geo_list", "years", "end_year", "force"))
+_normalize_wealth_indicators = functools.partial(_normalize_fields, ("geo_list", "years", "end_year", "force"))
+_normalize_wealth_age_structure = functools.partial(
+    _normalize_fields, ("geo_list", "end_year", "lookback_years", "force")
+)
 
 
-def _normalize_finance(raw: dict[str, Any]) -> dict[str, Any]:
+def _normalize_wealth_disposable(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
     return {"force": _as_bool(raw.get("force"), False)}
 
 
-def _normalize_cleanup(raw: dict[str, Any]) -> dict[str, Any]:
+def _normalize_finance(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
+    return {"force": _as_bool(raw.get("force"), False)}
+
+
+def _normalize_cleanup(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
     return {"keep_days": _as_int(raw.get("keep_days"), settings.JOB_RETENTION_DAYS, 1, 365)}
 
 
-def _normalize_generate_homepage_insights(raw: dict[str, Any]) -> dict[str, Any]:
-    card_key = str(raw.get("card_key") or "").strip()
-    if card_key not in ALLOWED_INSIGHT_CARD_KEYS:
-        card_key = ""
+def _allowed_key(value: Any, allowed: frozenset[str]) -> str:
+    # Clean values (the common case) are accepted without building a stripped copy.
+    if isinstance(value, str) and value in allowed:
+        return value
+    key = str(value or "").strip()
+    return key if key in allowed else ""
 
-    tab_key = str(raw.get("tab_key") or raw.get("type") or "").strip()
-    if tab_key not in ALLOWED_INSIGHT_TAB_KEYS:
-        tab_key = ""
+
+def _normalize_generate_homepage_insights(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
+    card_key = _allowed_key(raw.get("card_key"), ALLOWED_INSIGHT_CARD_KEYS)
+    tab_key = _allowed_key(raw.get("tab_key") or raw.get("type"), ALLOWED_INSIGHT_TAB_KEYS)
 
     lang = str(raw.get("lang") or "en").strip().lower() or "en"
 
     return {
         "lang": lang,
-        "geo_list": _as_geo_list(raw.get("geo_list")),
-        "scope": _normalize_scope_list(raw.get("scope")),
+        "geo_list": _as_geo_list(raw.get("geo_list"), db=db),
+        "scope": _normalize_scope_list(raw.get("scope"), db=db),
         "card_key": card_key,
         "tab_key": tab_key,
         "force_regen": _as_bool(raw.get("force_regen"), False),
@@ -363,63 +408,84 @@ def _infer_annual_source_updated_at(period: str | None) -> tuple[datetime | None
     return datetime(y, 12, 31, tzinfo=timezone.utc), "inferred from annual period year-end"
 
 
-def _run_trade_exim(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
-    count = 0
-    failed = 0
+_WDI_FETCH_WORKERS = 4
+
+
+def _fetch_per_geo(
+    db: Session, geo_list: list[str], fetch: Callable[[str], dict[str, Any]]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Fetch one World Bank payload per geo with a WDI code, in geo_list order.
+
+    The fetches are independent HTTP calls, so they run on a small thread pool; the
+    Session is only used here, on the job thread, to resolve WDI codes.
+    """
     wdi_map = get_geo_to_wdi(db)
-    for geo in params["geo_list"]:
-        code = wdi_map.get(geo)
-        if not code:
-            continue
-        payload = fetch_trade_exim_5y(
+    pairs = [(geo, wdi_map[geo]) for geo in geo_list if wdi_map.get(geo)]
+    if not pairs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(_WDI_FETCH_WORKERS, len(pairs)), thread_name_prefix="wdi-fetch") as pool:
+        payloads = list(pool.map(fetch, [code for _, code in pairs]))
+    out: list[tuple[str, dict[str, Any]]] = []
+    for (geo, _), payload in zip(pairs, payloads):
+        payload["geo"] = geo
+        out.append((geo, payload))
+    return out
+
+
+def _count_stale(fetched: list[tuple[str, dict[str, Any]]]) -> int:
+    return sum(1 for _, payload in fetched if not payload.get("ok"))
+
+
+def _run_trade_exim(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
+    fetched = _fetch_per_geo(
+        db,
+        params["geo_list"],
+        lambda code: fetch_trade_exim_5y(
             code,
             end_year=params["end_year"],
             years=params["years"],
             force=params["force"],
-        )
-        payload["geo"] = geo
+        ),
+    )
+    batch: list[dict[str, Any]] = []
+    fetched_at = _now_utc()
+    for geo, payload in fetched:
 
-        # choose the latest non-null period from the merged series
-        latest_period = None
-        for row in reversed(payload.get("series") or []):
-            if row.get("export_usd") is not None or row.get("import_usd") is not None:
-                latest_period = row.get("period")
-                break
-        src_at, src_note = _infer_annual_source_updated_at(latest_period)
+        # latest non-null period, located once while the series was merged
+        latest = _latest_trade_year_row(payload)
+        src_at, src_note = _infer_annual_source_updated_at(latest["period"] if latest else None)
 
-        stale = not bool(payload.get("ok"))
-        if stale:
-            failed += 1
         _record_snapshot(
             db,
             widget_key="trade_exim_5y",
             scope=geo,
             payload=payload,
             source=payload.get("source", ""),
-            is_stale=stale,
+            is_stale=not payload.get("ok"),
             job_run_id=job_run_id,
             source_updated_at=src_at,
             source_updated_at_note=src_note,
+            batch=batch,
+            fetched_at=fetched_at,
         )
-        count += 1
-    return f"trade exim snapshots saved: {count}, stale: {failed}"
+    _record_snapshots_bulk(db, batch)
+    return f"trade exim snapshots saved: {len(fetched)}, stale: {_count_stale(fetched)}"
 
 
 def _run_wealth_indicators(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
-    count = 0
-    failed = 0
-    wdi_map = get_geo_to_wdi(db)
-    for geo in params["geo_list"]:
-        code = wdi_map.get(geo)
-        if not code:
-            continue
-        payload = fetch_wealth_indicators_5y(
+    fetched = _fetch_per_geo(
+        db,
+        params["geo_list"],
+        lambda code: fetch_wealth_indicators_5y(
             code,
             end_year=params["end_year"],
             years=params["years"],
             force=params["force"],
-        )
-        payload["geo"] = geo
+        ),
+    )
+    batch: list[dict[str, Any]] = []
+    fetched_at = _now_utc()
+    for geo, payload in fetched:
 
         latest_period = None
         for row in reversed(payload.get("series") or []):
@@ -428,22 +494,21 @@ def _run_wealth_indicators(db: Session, params: dict[str, Any], job_run_id: int
                 break
         src_at, src_note = _infer_annual_source_updated_at(latest_period)
 
-        stale = not bool(payload.get("ok"))
-        if stale:
-            failed += 1
         _record_snapshot(
             db,
             widget_key="wealth_indicators_5y",
             scope=geo,
             payload=payload,
             source=payload.get("source", ""),
-            is_stale=stale,
+            is_stale=not payload.get("ok"),
             job_run_id=job_run_id,
             source_updated_at=src_at,
             source_updated_at_note=src_note,
+            batch=batch,
+            fetched_at=fetched_at,
         )
-        count += 1
-    return f"wealth indicator snapshots saved: {count}, stale: {failed}"
+    _record_snapshots_bulk(db, batch)
+    return f"wealth indicator snapshots saved: {len(fetched)}, stale: {_count_stale(fetched)}"
 
 
 def _run_wealth_disposable(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
@@ -469,39 +534,36 @@ def _run_wealth_disposable(db: Session, params: dict[str, Any], job_run_id: int
 
 
 def _run_wealth_age_structure(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
-    count = 0
-    failed = 0
-    wdi_map = get_geo_to_wdi(db)
-    for geo in params["geo_list"]:
-        code = wdi_map.get(geo)
-        if not code:
-            continue
-        payload = fetch_age_structure_latest(
+    fetched = _fetch_per_geo(
+        db,
+        params["geo_list"],
+        lambda code: fetch_age_structure_latest(
             code,
             end_year=params["end_year"],
             lookback_years=params["lookback_years"],
             force=params["force"],
-        )
-        payload["geo"] = geo
-
+        ),
+    )
+    batch: list[dict[str, Any]] = []
+    fetched_at = _now_utc()
+    for geo, payload in fetched:
         src_at, src_note = _infer_annual_source_updated_at(payload.get("period"))
 
-        stale = not bool(payload.get("ok"))
-        if stale:
-            failed += 1
         _record_snapshot(
             db,
             widget_key="wealth_age_structure_latest",
             scope=geo,
             payload=payload,
             source=payload.get("source", ""),
-            is_stale=stale,
+            is_stale=not payload.get("ok"),
             job_run_id=job_run_id,
             source_updated_at=src_at,
             source_updated_at_note=src_note,
+            batch=batch,
+            fetched_at=fetched_at,
         )
-        count += 1
-    return f"wealth age-structure snapshots saved: {count}, stale: {failed}"
+    _record_snapshots_bulk(db, batch)
+    return f"wealth age-structure snapshots saved: {len(fetched)}, stale: {_count_stale(fetched)}"
 
 
 def _run_finance_industry(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
@@ -547,18 +609,38 @@ def _run_finance_country(db: Session, params: dict[str, Any], job_run_id: int |
     return "finance country snapshot saved"
 
 
+_CLEANUP_BATCH_SIZE = 5000
+
+
+def _delete_older_than_in_batches(db: Session, model: Any, ts_column: Any, cutoff: datetime) -> int:
+    """Delete rows with ``ts_column < cutoff`` in bounded batches, committing after each.
+
+    Keeps each transaction's lock set / WAL volume small so a large retention backlog does
+    not block concurrent snapshot writers for the whole purge.
+    """
+    total = 0
+    while True:
+        ids = select(model.id).where(ts_column < cutoff).limit(_CLEANUP_BATCH_SIZE).scalar_subquery()
+        result = db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        deleted = int(result.rowcount or 0)
+        total += deleted
+        if deleted < _CLEANUP_BATCH_SIZE:
+            return total
+
+
 def _run_cleanup_snapshots(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
     del job_run_id
     cutoff = _now_utc() - timedelta(days=params["keep_days"])
-    snapshots_deleted = (
-        db.query(WidgetSnapshot).filter(WidgetSnapshot.fetched_at < cutoff).delete(synchronize_session=False)
-    )
-    runs_deleted = db.query(JobRun).filter(JobRun.started_at < cutoff).delete(synchronize_session=False)
+    snapshots_deleted = _delete_older_than_in_batches(db, WidgetSnapshot, WidgetSnapshot.fetched_at, cutoff)
+    runs_deleted = _delete_older_than_in_batches(db, JobRun, JobRun.started_at, cutoff)
     return f"cleanup done: snapshots={snapshots_deleted}, runs={runs_deleted}, keep_days={params['keep_days']}"
 
 
-from app.jobs.insights_llm import digest_for_inputs, generate_insight_with_llm
-from app.jobs.public_context import get_or_refresh_context, to_prompt_block
+from app.jobs.insights_llm import LLMResult, digest_for_inputs, generate_insight_with_llm, stable_json_dumps
+from app.jobs.public_context import get_or_refresh_contexts, to_prompt_block
 
 
 def _save_insight(
@@ -578,26 +660,30 @@ def _save_insight(
     llm_model: str = "",
     llm_prompt: str = "",
     llm_error: str = "",
+    batch: list[dict[str, Any]] | None = None,
 ) -> None:
-    db.add(
-        WidgetInsight(
-            card_key=card_key,
-            tab_key=tab_key,
-            scope=scope,
-            lang=lang,
-            content=content,
-            reference_list=reference_list or [],
-            source_updated_at=source_updated_at,
-            data_digest=data_digest,
-            input_snapshot_keys=input_snapshot_keys or [],
-            llm_provider=llm_provider or "",
-            llm_model=llm_model or "",
-            llm_prompt=llm_prompt or "",
-            llm_error=llm_error or "",
-            generated_by="llm",
-            job_run_id=job_run_id,
-        )
-    )
+    """Add one LLM insight, or append it to ``batch`` for a later bulk INSERT."""
+    row = {
+        "card_key": card_key,
+        "tab_key": tab_key,
+        "scope": scope,
+        "lang": lang,
+        "content": content,
+        "reference_list": reference_list or [],
+        "source_updated_at": source_updated_at,
+        "data_digest": data_digest,
+        "input_snapshot_keys": input_snapshot_keys or [],
+        "llm_provider": llm_provider or "",
+        "llm_model": llm_model or "",
+        "llm_prompt": llm_prompt or "",
+        "llm_error": llm_error or "",
+        "generated_by": "llm",
+        "job_run_id": job_run_id,
+    }
+    if batch is not None:
+        batch.append(row)
+        return
+    db.add(WidgetInsight(**row))
 
 
 def _save_insight_generate_log(
@@ -620,160 +706,364 @@ def _save_insight_generate_log(
     parsed_references: list[dict[str, Any]] | None,
     ok: bool,
     error: str,
+    batch: list[dict[str, Any]] | None = None,
 ) -> None:
-    db.add(
-        InsightGenerateLog(
-            job_run_id=job_run_id,
-            card_key=card_key,
-            tab_key=tab_key,
-            scope=scope,
-            lang=lang,
-            llm_provider=llm_provider or "",
-            llm_model=llm_model or "",
-            endpoint=endpoint or "",
-            request_system=request_system or "",
-            request_user=request_user or "",
-            request_payload=request_payload or {},
-            response_status=response_status,
-            response_raw=response_raw or "",
-            parsed_content=parsed_content or "",
-            parsed_references=parsed_references or [],
-            ok=bool(ok),
-            error=error or "",
-        )
-    )
+    """Add one generate-log row, or append it to ``batch`` for a later bulk INSERT."""
+    row = {
+        "job_run_id": job_run_id,
+        "card_key": card_key,
+        "tab_key": tab_key,
+        "scope": scope,
+        "lang": lang,
+        "llm_provider": llm_provider or "",
+        "llm_model": llm_model or "",
+        "endpoint": endpoint or "",
+        "request_system": request_system or "",
+        "request_user": request_user or "",
+        "request_payload": request_payload or {},
+        "response_status": response_status,
+        "response_raw": response_raw or "",
+        "parsed_content": parsed_content or "",
+        "parsed_references": parsed_references or [],
+        "ok": bool(ok),
+        "error": error or "",
+    }
+    if batch is not None:
+        batch.append(row)
+        return
+    db.add(InsightGenerateLog(**row))
+
+
+def _trade_year_row(row: dict[str, Any]) -> dict[str, Any]:
+    ex_raw = row.get("export_usd")
+    im_raw = row.get("import_usd")
+    try:
+        ex = float(ex_raw) if ex_raw is not None else None
+    except Exception:
+        ex = None
+    try:
+        im = float(im_raw) if im_raw is not None else None
+    except Exception:
+        im = None
+    bal = None
+    if ex is not None or im is not None:
+        bal = (ex or 0) - (im or 0)
+    return {
+        "period": row.get("period"),
+        "export_usd": ex,
+        "import_usd": im,
+        "balance_usd": bal,
+    }
 
 
 def _latest_trade_year_row(exim_payload: dict[str, Any]) -> dict[str, Any] | None:
     series = exim_payload.get("series")
     if not isinstance(series, list):
         return None
+    # fetch_trade_exim_5y records the index while merging; snapshots written
+    # before that key existed fall back to scanning from the end.
+    if "latest_idx" in exim_payload:
+        idx = exim_payload.get("latest_idx")
+        if isinstance(idx, int) and 0 <= idx < len(series) and isinstance(series[idx], dict):
+            return _trade_year_row(series[idx])
+        return None
     for row in reversed(series):
         if not isinstance(row, dict):
             continue
         if row.get("export_usd") is None and row.get("import_usd") is None:
             continue
-        ex_raw = row.get("export_usd")
-        im_raw = row.get("import_usd")
-        try:
-            ex = float(ex_raw) if ex_raw is not None else None
-        except Exception:
-            ex = None
-        try:
-            im = float(im_raw) if im_raw is not None else None
-        except Exception:
-            im = None
-        bal = None
-        if ex is not None or im is not None:
-            bal = (ex or 0) - (im or 0)
-        return {
-            "period": row.get("period"),
-            "export_usd": ex,
-            "import_usd": im,
-            "balance_usd": bal,
-        }
+        return _trade_year_row(row)
     return None
 
 
+def _list_or_empty(value: Any) -> list[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _display_trade_corridors(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    by_geo = payload.get("by_geo")
+    row = {}
+    if isinstance(by_geo, dict):
+        g = by_geo.get("Global")
+        if isinstance(g, dict):
+            row = g
+    return {
+        "geo": "Global",
+        "period": row.get("period"),
+        "value_usd_top": row.get("value_usd_top") or [],
+        "volume_top": row.get("volume_top") or [],
+        "export_usd": row.get("export_usd"),
+        "import_usd": row.get("import_usd"),
+        "trade_balance_usd": row.get("trade_balance_usd"),
+        "source": payload.get("source"),
+        "updated_at": payload.get("updated_at"),
+    }
+
+
+def _display_trade_wci(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    wci = payload.get("wci")
+    return {"wci": wci if isinstance(wci, dict) else {}, "source": payload.get("source"), "updated_at": payload.get("updated_at")}
+
+
+def _display_trade_portwatch(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    portwatch = payload.get("portwatch")
+    return {"portwatch": portwatch if isinstance(portwatch, dict) else {}, "source": payload.get("source"), "updated_at": payload.get("updated_at")}
+
+
+def _display_trade_exim(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    return {
+        "geo": scope,
+        "latest": _latest_trade_year_row(payload),
+        "series": _list_or_empty(payload.get("series")),
+        "source": payload.get("source"),
+        "frequency": payload.get("frequency"),
+        "date": payload.get("date"),
+    }
+
+
+def _display_wealth_series(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    return {
+        "geo": scope,
+        "series": _list_or_empty(payload.get("series")),
+        "source": payload.get("source"),
+        "frequency": payload.get("frequency"),
+        "date": payload.get("date"),
+    }
+
+
+def _display_wealth_age(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    return {
+        "geo": scope,
+        "rows": _list_or_empty(payload.get("rows")),
+        "source": payload.get("source"),
+        "frequency": payload.get("frequency"),
+        "period": payload.get("period"),
+    }
+
+
+def _display_wealth_disposable(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    rows = payload.get("rows")
+    row = {}
+    if isinstance(rows, dict):
+        one = rows.get(scope)
+        if isinstance(one, dict):
+            row = one
+    return {
+        "geo": scope,
+        "row": row,
+        "source": payload.get("source"),
+        "link": payload.get("link"),
+        "note": "latest point only",
+    }
+
+
+def _display_finance_industry(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    return {
+        "rows_top10": _list_or_empty(payload.get("rows"))[:10],
+        "source": payload.get("source"),
+        "link": payload.get("link"),
+        "unit": payload.get("unit"),
+        "currency": payload.get("currency"),
+    }
+
+
+def _display_finance_country(payload: dict[str, Any], scope: str) -> dict[str, Any]:
+    return {
+        "rows_top10": _list_or_empty(payload.get("rows"))[:10],
+        "source": payload.get("source"),
+        "link": payload.get("link"),
+    }
+
+
+_DISPLAY_HANDLERS: dict[tuple[str, str], Callable[[dict[str, Any], str], dict[str, Any]]] = {
+    ("trade_flow", "corridors"): _display_trade_corridors,
+    ("trade_flow", "wci"): _display_trade_wci,
+    ("trade_flow", "portwatch"): _display_trade_portwatch,
+    ("trade_flow", "exim"): _display_trade_exim,
+    ("trade_flow", "balance"): _display_trade_exim,
+    ("wealth", "gdp_pc"): _display_wealth_series,
+    ("wealth", "cons"): _display_wealth_series,
+    ("wealth", "age"): _display_wealth_age,
+    ("wealth", "disp_pc"): _display_wealth_disposable,
+    ("wealth", "disp_hh"): _display_wealth_disposable,
+    ("finance", "industry"): _display_finance_industry,
+    ("finance", "country"): _display_finance_country,
+}
+
+
 def _display_data_for_llm(card_key: str, tab_key: str, scope: str, snapshot_inputs: list[WidgetSnapshot]) -> dict[str, Any]:
     if not snapshot_inputs:
         return {}
     payload = snapshot_inputs[0].payload if isinstance(snapshot_inputs[0].payload, dict) else {}
+    handler = _DISPLAY_HANDLERS.get((card_key, tab_key))
+    if handler is None:
+        return {"payload": payload}
+    return handler(payload, scope)
+
+
+@dataclass(slots=True)
+class SnapshotRef:
+    """Provenance pointer to one snapshot used as insight input."""
+
+    widget_key: str
+    scope: str
+    snapshot_id: int
+    fetched_at: str | None
+    source_updated_at: str | None
+
+    @classmethod
+    def from_snapshot(cls, s: WidgetSnapshot) -> SnapshotRef:
+        return cls(
+            widget_key=s.widget_key,
+            scope=s.scope,
+            snapshot_id=int(s.id),
+            fetched_at=s.fetched_at.isoformat() if s.fetched_at else None,
+            source_updated_at=s.source_updated_at.isoformat() if s.source_updated_at else None,
+        )
 
-    if card_key == "trade_flow":
-        if tab_key == "corridors":
-            by_geo = payload.get("by_geo")
-            row = {}
-            if isinstance(by_geo, dict):
-                g = by_geo.get("Global")
-                if isinstance(g, dict):
-                    row = g
-            return {
-                "geo": "Global",
-                "period": row.get("period"),
-                "value_usd_top": row.get("value_usd_top") or [],
-                "volume_top": row.get("volume_top") or [],
-                "export_usd": row.get("export_usd"),
-                "import_usd": row.get("import_usd"),
-                "trade_balance_usd": row.get("trade_balance_usd"),
-                "source": payload.get("source"),
-                "updated_at": payload.get("updated_at"),
-            }
-        if tab_key == "wci":
-            wci = payload.get("wci")
-            return {"wci": wci if isinstance(wci, dict) else {}, "source": payload.get("source"), "updated_at": payload.get("updated_at")}
-        if tab_key == "portwatch":
-            portwatch = payload.get("portwatch")
-            return {"portwatch": portwatch if isinstance(portwatch, dict) else {}, "source": payload.get("source"), "updated_at": payload.get("updated_at")}
-        if tab_key in {"exim", "balance"}:
-            return {
-                "geo": scope,
-                "latest": _latest_trade_year_row(payload),
-                "series": payload.get("series") if isinstance(payload.get("series"), list) else [],
-                "source": payload.get("source"),
-                "frequency": payload.get("frequency"),
-                "date": payload.get("date"),
-            }
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "widget_key": self.widget_key,
+            "scope": self.scope,
+            "snapshot_id": self.snapshot_id,
+            "fetched_at": self.fetched_at,
+            "source_updated_at": self.source_updated_at,
+        }
 
-    if card_key == "wealth":
-        if tab_key in {"gdp_pc", "cons"}:
-            return {
-                "geo": scope,
-                "series": payload.get("series") if isinstance(payload.get("series"), list) else [],
-                "source": payload.get("source"),
-                "frequency": payload.get("frequency"),
-                "date": payload.get("date"),
-            }
-        if tab_key == "age":
-            return {
-                "geo": scope,
-                "rows": payload.get("rows") if isinstance(payload.get("rows"), list) else [],
-                "source": payload.get("source"),
-                "frequency": payload.get("frequency"),
-                "period": payload.get("period"),
-            }
-        if tab_key in {"disp_pc", "disp_hh"}:
-            rows = payload.get("rows")
-            row = {}
-            if isinstance(rows, dict):
-                one = rows.get(scope)
-                if isinstance(one, dict):
-                    row = one
-            return {
-                "geo": scope,
-                "row": row,
-                "source": payload.get("source"),
-                "link": payload.get("link"),
-                "note": "latest point only",
-            }
 
-    if card_key == "finance":
-        if tab_key == "industry":
-            rows = payload.get("rows")
-            if not isinstance(rows, list):
-                rows = []
-            return {
-                "rows_top10": rows[:10],
-                "source": payload.get("source"),
-                "link": payload.get("link"),
-                "unit": payload.get("unit"),
-                "currency": payload.get("currency"),
-            }
-        if tab_key == "country":
-            rows = payload.get("rows")
-            if not isinstance(rows, list):
-                rows = []
-            return {
-                "rows_top10": rows[:10],
-                "source": payload.get("source"),
-                "link": payload.get("link"),
-            }
+@dataclass(slots=True)
+class InsightInputs:
+    """Stable input object for one (card, tab, scope, lang) insight.
 
-    return {"payload": payload}
+    ``as_dict()`` builds the shallow mapping used for digesting and prompting; it is
+    intentionally not ``dataclasses.asdict`` which would deep-copy every payload.
+    """
 
+    card_key: str
+    tab_key: str
+    scope: str
+    lang: str
+    display_data: dict[str, Any]
+    snapshots: list[dict[str, Any]]
+    extra: dict[str, Any]
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        card_key: str,
+        tab_key: str,
+        scope: str,
+        lang: str,
+        snapshot_inputs: list[WidgetSnapshot],
+        extra_context: dict[str, Any],
+    ) -> InsightInputs:
+        return cls(
+            card_key=card_key,
+            tab_key=tab_key,
+            scope=scope,
+            lang=lang,
+            display_data=_display_data_for_llm(card_key, tab_key, scope, snapshot_inputs),
+            snapshots=[{"key": s.widget_key, "scope": s.scope, "payload": s.payload} for s in snapshot_inputs],
+            extra=extra_context,
+        )
 
-def _gen_insight(
-    db: Session,
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "card_key": self.card_key,
+            "tab_key": self.tab_key,
+            "scope": self.scope,
+            "lang": self.lang,
+            "display_data": self.display_data,
+            "snapshots": self.snapshots,
+            "extra": self.extra,
+        }
+
+
+def _json_member(key: str, value: Any) -> str:
+    return f"{json.dumps(key)}: {stable_json_dumps(value)}"
+
+
+# Invariant members of the card insight prompt, serialized once. Members are
+# joined in sorted-key order so the prompt matches json.dumps(..., sort_keys=True).
+_INSIGHT_PROMPT_AUDIENCE = _json_member("audience", ["economic analysts", "executives"])
+_INSIGHT_PROMPT_CONSTRAINTS = _json_member(
+    "constraints",
+    {
+        "length": "2-4 bullets",
+        "must_reference_data": True,
+        "must_use_source_updated_at": True,
+        "avoid_job_time": True,
+        "no_fabrication": True,
+        "json_max_chars": 10000,
+    },
+)
+_INSIGHT_PROMPT_TASK = _json_member("task", "Generate dashboard Insight")
+
+
+def _insight_user_prompt(
+    *, card_key: str, tab_key: str, scope: str, inputs: dict[str, Any], public_urls: list[str]
+) -> str:
+    members = (
+        _INSIGHT_PROMPT_AUDIENCE,
+        _json_member("candidate_public_urls", public_urls),
+        _json_member("card_key", card_key),
+        _INSIGHT_PROMPT_CONSTRAINTS,
+        _json_member("inputs", inputs),
+        _json_member("scope", scope),
+        _json_member("tab_key", tab_key),
+        _INSIGHT_PROMPT_TASK,
+    )
+    return "{" + ", ".join(members) + "}"
+
+
+_INSIGHT_SYSTEM_PROMPT = (
+    "You are a macroeconomic analyst and corporate strategy advisor. Your readers are (1) economic analysts and "
+    "(2) senior executives. Write a concise, decision-oriented Insight for the selected dashboard card/tab. "
+    "Use ONLY the provided data, its source metadata, the declared/inferred source-updated time, and the provided public excerpts. "
+    "Do NOT mention job execution times. Do NOT invent numbers. "
+    "If data is proxy/nowcast/scraped, explicitly caveat. "
+    "Style: 2-4 short bullet points max, each bullet actionable or interpretive. "
+    "Keep the JSON output compact (<= ~10000 chars). "
+    "Return STRICT JSON with keys: insight (string), references (array of {title,url,publisher,date})."
+)
+
+
+@dataclass(slots=True)
+class InsightRequest:
+    """Everything needed to call the LLM for one insight and persist the result.
+
+    Built on the job thread from already-loaded snapshots, so the LLM call itself
+    needs no Session and can run on a worker thread. The user prompt is rendered
+    only when the request is actually sent, so digest-skipped requests never pay
+    for serializing their inputs.
+    """
+
+    card_key: str
+    tab_key: str
+    scope: str
+    lang: str
+    system: str
+    inputs: dict[str, Any]
+    public_urls: list[str]
+    data_digest: str
+    input_snapshot_keys: list[dict[str, Any]]
+    source_updated_at: datetime | None
+    user: str = ""
+
+    def render_user_prompt(self) -> str:
+        if not self.user:
+            self.user = _insight_user_prompt(
+                card_key=self.card_key,
+                tab_key=self.tab_key,
+                scope=self.scope,
+                inputs=self.inputs,
+                public_urls=self.public_urls,
+            )
+        return self.user
+
+
+def _prepare_insight(
     *,
     card_key: str,
     tab_key: str,
@@ -781,94 +1071,70 @@ def _gen_insight(
     lang: str,
     snapshot_inputs: list[WidgetSnapshot],
     extra_context: dict[str, Any],
-    fallback_text: str,
-    job_run_id: int | None,
-) -> tuple[bool, str | None]:
-    del fallback_text
+) -> InsightRequest:
     # Build a stable input object
-    input_keys = []
-    for s in snapshot_inputs:
-        input_keys.append(
-            {
-                "widget_key": s.widget_key,
-                "scope": s.scope,
-                "snapshot_id": int(s.id),
-                "fetched_at": s.fetched_at.isoformat() if s.fetched_at else None,
-                "source_updated_at": s.source_updated_at.isoformat() if s.source_updated_at else None,
-            }
-        )
-
-    input_obj = {
-        "card_key": card_key,
-        "tab_key": tab_key,
-        "scope": scope,
-        "lang": lang,
-        "display_data": _display_data_for_llm(card_key, tab_key, scope, snapshot_inputs),
-        "snapshots": [{"key": s.widget_key, "scope": s.scope, "payload": s.payload} for s in snapshot_inputs],
-        "extra": extra_context,
-    }
-    data_digest = digest_for_inputs(input_obj)
-
-    # Ask LLM to do research-style synthesis (optional). It should be grounded in provided data and cite sources.
-    system = (
-        "You are a macroeconomic analyst and corporate strategy advisor. Your readers are (1) economic analysts and "
-        "(2) senior executives. Write a concise, decision-oriented Insight for the selected dashboard card/tab. "
-        "Use ONLY the provided data, its source metadata, the declared/inferred source-updated time, and the provided public excerpts. "
-        "Do NOT mention job execution times. Do NOT invent numbers. "
-        "If data is proxy/nowcast/scraped, explicitly caveat. "
-        "Style: 2-4 short bullet points max, each bullet actionable or interpretive. "
-        "Keep the JSON output compact (<= ~10000 chars). "
-        "Return STRICT JSON with keys: insight (string), references (array of {title,url,publisher,date})."
-    )
+    input_obj = InsightInputs.build(
+        card_key=card_key,
+        tab_key=tab_key,
+        scope=scope,
+        lang=lang,
+        snapshot_inputs=snapshot_inputs,
+        extra_context=extra_context,
+    ).as_dict()
 
     # Provide the model with candidate public URLs it may cite (no guarantee it can browse).
     public_urls: list[str] = []
+    seen_urls: set[str] = set()
+    candidates: list[Any] = []
     for s in snapshot_inputs:
         if isinstance(s.payload, dict):
-            for k in ("link", "url"):
-                v = s.payload.get(k)
-                if isinstance(v, str) and v.startswith("http") and v not in public_urls:
-                    public_urls.append(v)
-    for v in extra_context.values():
-        if isinstance(v, str) and v.startswith("http") and v not in public_urls:
+            candidates.extend(s.payload.get(k) for k in ("link", "url"))
+    candidates.extend(extra_context.values())
+    for v in candidates:
+        if isinstance(v, str) and v.startswith("http") and v not in seen_urls:
+            seen_urls.add(v)
             public_urls.append(v)
 
-    user = json.dumps(
-        {
-            "task": "Generate dashboard Insight",
-            "audience": ["economic analysts", "executives"],
-            "card_key": card_key,
-            "tab_key": tab_key,
-            "scope": scope,
-            "constraints": {
-                "length": "2-4 bullets",
-                "must_reference_data": True,
-                "must_use_source_updated_at": True,
-                "avoid_job_time": True,
-                "no_fabrication": True,
-                "json_max_chars": 10000,
-            },
-            "inputs": input_obj,
-            "candidate_public_urls": public_urls,
-        },
-        ensure_ascii=False,
-        sort_keys=True,
-        default=str,
-    )
+    # Prefer the freshest source_updated_at among inputs (NOT fetched_at). The snapshots
+    # are already loaded, so this stays in memory rather than costing another query.
+    src_at = max((s.source_updated_at for s in snapshot_inputs if s.source_updated_at), default=None)
 
-    llm = generate_insight_with_llm(system=system, user=user)
-    _save_insight_generate_log(
-        db,
+    return InsightRequest(
         card_key=card_key,
         tab_key=tab_key,
         scope=scope,
         lang=lang,
+        # Ask LLM to do research-style synthesis. It should be grounded in provided data and cite sources.
+        system=_INSIGHT_SYSTEM_PROMPT,
+        inputs=input_obj,
+        public_urls=public_urls,
+        data_digest=digest_for_inputs(input_obj),
+        input_snapshot_keys=[SnapshotRef.from_snapshot(s).as_dict() for s in snapshot_inputs],
+        source_updated_at=src_at,
+    )
+
+
+def _persist_insight(
+    db: Session,
+    req: InsightRequest,
+    llm: LLMResult,
+    job_run_id: int | None,
+    *,
+    log_batch: list[dict[str, Any]] | None = None,
+    insight_batch: list[dict[str, Any]] | None = None,
+) -> tuple[bool, str | None]:
+    _save_insight_generate_log(
+        db,
+        card_key=req.card_key,
+        tab_key=req.tab_key,
+        scope=req.scope,
+        lang=req.lang,
         job_run_id=job_run_id,
         llm_provider=llm.provider,
         llm_model=llm.model,
         endpoint=llm.endpoint,
-        request_system=system,
-        request_user=user,
+        request_system=req.system,
+        request_user=req.user,
         request_payload=llm.request_payload,
         response_status=llm.response_status,
         response_raw=llm.response_raw,
@@ -876,39 +1142,280 @@ def _gen_insight(
         parsed_references=llm.references,
         ok=llm.ok,
         error=llm.error or "",
+        batch=log_batch,
     )
     if not llm.ok:
         return False, llm.error or "llm generation failed"
 
-    content = llm.content
-    references = llm.references if isinstance(llm.references, list) else []
-
-    # Prefer the freshest source_updated_at among inputs (NOT fetched_at)
-    src_at = None
-    for s in snapshot_inputs:
-        if s.source_updated_at and (src_at is None or s.source_updated_at > src_at):
-            src_at = s.source_updated_at
-
     _save_insight(
         db,
-        card_key=card_key,
-        tab_key=tab_key,
-        scope=scope,
-        lang=lang,
-        content=content,
-        reference_list=references,
-        source_updated_at=src_at,
+        card_key=req.card_key,
+        tab_key=req.tab_key,
+        scope=req.scope,
+        lang=req.lang,
+        content=llm.content,
+        reference_list=llm.references if isinstance(llm.references, list) else [],
+        source_updated_at=req.source_updated_at,
         job_run_id=job_run_id,
-        data_digest=data_digest,
-        input_snapshot_keys=input_keys,
+        data_digest=req.data_digest,
+        input_snapshot_keys=req.input_snapshot_keys,
         llm_provider=llm.provider,
         llm_model=llm.model,
-        llm_prompt=user,
+        llm_prompt=req.user,
         llm_error="",
+        batch=insight_batch,
     )
     return True, None
 
 
+def _latest_insight_digests(
+    db: Session, requests: list[InsightRequest]
+) -> dict[tuple[str, str, str, str], str]:
+    """data_digest of the newest LLM insight for each requested (card, tab, scope, lang).
+
+    One DISTINCT ON query over idx_widget_insights_lookup. Comparing against the newest
+    row (not any row) keeps A -> B -> A data changes from leaving B's insight on display.
+    """
+    keys = {(r.card_key, r.tab_key, r.scope, r.lang) for r in requests}
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(
+            WidgetInsight.card_key,
+            WidgetInsight.tab_key,
+            WidgetInsight.scope,
+            WidgetInsight.lang,
+            WidgetInsight.data_digest,
+        )
+        .where(
+            tuple_(WidgetInsight.card_key, WidgetInsight.tab_key, WidgetInsight.scope, WidgetInsight.lang).in_(keys),
+            WidgetInsight.generated_by == "llm",
+        )
+        .distinct(WidgetInsight.card_key, WidgetInsight.tab_key, WidgetInsight.scope, WidgetInsight.lang)
+        .order_by(
+            WidgetInsight.card_key,
+            WidgetInsight.tab_key,
+            WidgetInsight.scope,
+            WidgetInsight.lang,
+            desc(WidgetInsight.created_at),
+        )
+    ).all()
+    out: dict[tuple[str, str, str, str], str] = {}
+    for card_key, tab_key, scope, lang, digest in rows:
+        out.setdefault((card_key, tab_key, scope, lang), digest)
+    return out
+
+
+def _call_llm(req: InsightRequest) -> LLMResult:
+    return generate_insight_with_llm(system=req.system, user=req.render_user_prompt())
+
+
+def _generate_insights(
+    db: Session, requests: list[InsightRequest], job_run_id: int | None
+) -> list[tuple[InsightRequest, bool, str | None]]:
+    """Run the LLM calls concurrently and persist the results on the job's Session.
+
+    The calls are network-bound and independent. Results are collected as they complete,
+    always on this thread because the Session is not thread-safe (a worker never touches
+    the DB), and written with one executemany INSERT per table at the end.
+    """
+    if not requests:
+        return []
+    log_rows: list[dict[str, Any]] = []
+    insight_rows: list[dict[str, Any]] = []
+
+    def persist(req: InsightRequest, llm: LLMResult) -> tuple[InsightRequest, bool, str | None]:
+        return (req, *_persist_insight(db, req, llm, job_run_id, log_batch=log_rows, insight_batch=insight_rows))
+
+    workers = max(1, min(settings.INSIGHT_LLM_CONCURRENCY, len(requests)))
+    out: list[tuple[InsightRequest, bool, str | None]] = []
+    try:
+        if workers == 1:
+            out.extend(persist(req, _call_llm(req)) for req in requests)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="insight-llm") as pool:
+                futures = {pool.submit(_call_llm, req): req for req in requests}
+                for future in as_completed(futures):
+                    out.append(persist(futures[future], future.result()))
+    finally:
+        # Failed runs are still committed by run_job_now, so keep what was collected.
+        if log_rows:
+            db.execute(insert(InsightGenerateLog), log_rows)
+        if insight_rows:
+            db.execute(insert(WidgetInsight), insight_rows)
+    return out
+
+
+# Snapshot widgets read by the homepage and executive insight jobs.
+_INSIGHT_WIDGET_KEYS = (
+    "trade_corridors",
+    "trade_exim_5y",
+    "wealth_indicators_5y",
+    "wealth_disposable_latest",
+    "wealth_age_structure_latest",
+    "finance_ma_industry",
+    "finance_ma_country",
+)
+
+
+_JOB_STATE_TABLE = WidgetInsightJobState.__table__
+
+
+def _advance_insight_cursor(db: Session, cursor_key: str, size: int) -> int:
+    """Atomically advance the geo rotation cursor and return the index to process.
+
+    A single INSERT ... ON CONFLICT DO UPDATE ... RETURNING replaces the old
+    SELECT + ORM update, so concurrent scheduled/manual runs never read the same
+    cursor value and the row is created on first use without a separate flush.
+    """
+    t = _JOB_STATE_TABLE
+    current = func.coalesce(t.c.value["geo_idx"].astext.cast(Integer), 0)
+    stmt = pg_insert(t).values(key=cursor_key, value={"geo_idx": 1 % size}, updated_at=_now_utc())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[t.c.key],
+        set_={
+            "value": func.jsonb_build_object(literal_column("'geo_idx'"), (current + 1) % size),
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(t.c.value)
+    value = db.execute(stmt).scalar_one()
+    return (int((value or {}).get("geo_idx") or 0) - 1) % size
+
+
+# Public context URLs per (card, tab); fetched by jobs only and cached in public_contexts.
+_INSIGHT_CONTEXT_URLS: dict[tuple[str, str], tuple[str, ...]] = {
+    ("trade_flow", "wci"): (
+        "https://www.drewry.co.uk/supply-chain-advisors/supply-chain-expertise/world-container-index-assessed-by-drewry",
+    ),
+    ("trade_flow", "portwatch"): (
+        "https://portwatch.imf.org/pages/data-and-methodology",
+    ),
+    ("trade_flow", "exim"): (
+        "https://data.worldbank.org/indicator/NE.EXP.GNFS.CD",
+        "https://data.worldbank.org/indicator/NE.IMP.GNFS.CD",
+    ),
+    ("wealth", "gdp_pc"): (
+        "https://data.worldbank.org/indicator/NY.GDP.PCAP.CD",
+    ),
+    ("wealth", "cons"): (
+        "https://data.worldbank.org/indicator/NE.CON.PRVT.CD",
+    ),
+    ("wealth", "age"): (
+        "https://data.worldbank.org/indicator/SP.POP.0014.TO.ZS",
+        "https://data.worldbank.org/indicator/SP.POP.1564.TO.ZS",
+        "https://data.worldbank.org/indicator/SP.POP.65UP.TO.ZS",
+    ),
+    ("wealth", "disp_pc"): (
+        "https://worldpopulationreview.com/country-rankings/disposable-income-by-country",
+        "https://data.worldbank.org/indicator/NE.CON.PRVT.PC.KD",
+    ),
+    ("wealth", "disp_hh"): (
+        "https://worldpopulationreview.com/country-rankings/disposable-income-by-country",
+        "https://data.worldbank.org/indicator/NE.CON.PRVT.PC.KD",
+    ),
+    ("finance", "industry"): (
+        "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-industries/",
+    ),
+    ("finance", "country"): (
+        "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-countries/",
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HomepageInsightSpec:
+    """One homepage card/tab insight and how its LLM extra_context is assembled.
+
+    extra_context always carries public_contexts and force_regen; the flags below add
+    the rest (geo for per-geo tabs, the snapshot's source fields, static notes).
+    """
+
+    card_key: str
+    tab_key: str
+    widget_key: str
+    per_geo: bool = False
+    # Per-geo tab fed by the widget's Global snapshot (no per-geo snapshots exist).
+    global_snapshot: bool = False
+    # extra_context key that receives payload["rows"][geo] of a Global snapshot.
+    row_key: str = ""
+    snapshot_source: bool = True
+    static_context: tuple[tuple[str, Any], ...] = ()
+    # Public-context URLs are looked up under (card_key, context_tab or tab_key).
+    context_tab: str = ""
+    # Caveat for the card; not sent to the LLM.
+    fallback_text: str = ""
+
+    @property
+    def context_key(self) -> tuple[str, str]:
+        return (self.card_key, self.context_tab or self.tab_key)
+
+
+_HOMEPAGE_INSIGHT_SPECS: tuple[HomepageInsightSpec, ...] = (
+    HomepageInsightSpec(
+        "trade_flow", "corridors", "trade_corridors",
+        fallback_text="Top corridors are a directional signal; compare value vs volume leaders to spot reroutes or mix changes.",
+    ),
+    HomepageInsightSpec(
+        "trade_flow", "wci", "trade_corridors",
+        snapshot_source=False,
+        static_context=(("source", "Drewry WCI (scrape)"), ("note", "shipping cost proxy")),
+        fallback_text="Freight (WCI) reflects shipping-cost pressure; treat it as a proxy signal rather than customs trade value.",
+    ),
+    HomepageInsightSpec(
+        "trade_flow", "portwatch", "trade_corridors",
+        snapshot_source=False,
+        static_context=(("source", "IMF PortWatch"), ("note", "nowcast/proxy")),
+        fallback_text="PortWatch signals are nowcast/proxy indicators; always present them with explicit caveats.",
+    ),
+    HomepageInsightSpec(
+        "trade_flow", "exim", "trade_exim_5y", per_geo=True,
+        fallback_text="Export/import snapshot is available; compare latest vs prior year to spot inflection points.",
+    ),
+    HomepageInsightSpec(
+        "trade_flow", "balance", "trade_exim_5y", per_geo=True,
+        snapshot_source=False,
+        static_context=(("definition", "balance = export - import"),),
+        context_tab="exim",
+        fallback_text="Trade balance is computed as export minus import; watch for large year-over-year moves.",
+    ),
+    HomepageInsightSpec(
+        "wealth", "gdp_pc", "wealth_indicators_5y", per_geo=True,
+        fallback_text="GDP per capita (nominal USD) can be noisy due to FX; interpret trends with caveats.",
+    ),
+    HomepageInsightSpec(
+        "wealth", "cons", "wealth_indicators_5y", per_geo=True,
+        fallback_text="Consumption can proxy domestic-demand momentum; compare with trade signals for context.",
+    ),
+    HomepageInsightSpec(
+        "wealth", "age", "wealth_age_structure_latest", per_geo=True,
+        fallback_text="Age structure provides demographic context; treat it as population composition (not income-by-age).",
+    ),
+    HomepageInsightSpec(
+        "wealth", "disp_pc", "wealth_disposable_latest", per_geo=True,
+        global_snapshot=True, row_key="disposable_row",
+        fallback_text="Disposable income is best-effort: WPR scrape + World Bank proxy fallback; treat as indicative latest point.",
+    ),
+    HomepageInsightSpec(
+        "wealth", "disp_hh", "wealth_disposable_latest", per_geo=True,
+        global_snapshot=True, row_key="disposable_row",
+        fallback_text="Household disposable values may be missing; consider OECD SDMX where coverage exists.",
+    ),
+    HomepageInsightSpec(
+        "finance", "industry", "finance_ma_industry",
+        fallback_text="Industry ranking reflects disclosed-deal reporting; treat as directional concentration of activity.",
+    ),
+    HomepageInsightSpec(
+        "finance", "country", "finance_ma_country",
+        fallback_text="Country narratives may mix currencies; use normalized FX conversion for strict comparisons.",
+    ),
+)
+
+
+def _payload_rows(snapshot: WidgetSnapshot | None) -> dict[str, Any]:
+    rows = snapshot.payload.get("rows") if snapshot and isinstance(snapshot.payload, dict) else None
+    return rows if isinstance(rows, dict) else {}
+
+
 def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run_id: int | None) -> str:
     """Generate Insights for homepage cards/tabs.
 
@@ -925,12 +1432,6 @@ def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run
         .filter(WidgetInsight.generated_by != "llm")
         .delete(synchronize_session=False)
     )
-    before_count = (
-        db.query(func.count(WidgetInsight.id))
-        .filter(WidgetInsight.generated_by == "llm")
-        .scalar()
-        or 0
-    )
 
     lang = str((params or {}).get("lang") or "en").strip() or "en"
     requested_geos = (params or {}).get("geo_list")
@@ -944,17 +1445,13 @@ def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run
     card_filter = ((params or {}).get("card_key") or "").strip()
     tab_filter = ((params or {}).get("tab_key") or (params or {}).get("type") or "").strip()
     scope_param = (params or {}).get("scope")
-    scope_filters = _normalize_scope_list(scope_param)
+    scope_filters = _normalize_scope_list(scope_param, db=db)
+    # Every scope handed to want() below is already canonical (fixed "Global" or a geo from
+    # the lists above), so membership is a set lookup rather than a DB-backed re-canonicalise.
+    scope_filter_set = frozenset(scope_filters)
 
     # Batching cursor (rotate geos across runs) when scopes not manually specified
-    from app.db.models import WidgetInsightJobState
-
     cursor_key = f"generate_homepage_insights:{lang}"  # one cursor per language
-    state = db.query(WidgetInsightJobState).filter(WidgetInsightJobState.key == cursor_key).first()
-    if state is None:
-        state = WidgetInsightJobState(key=cursor_key, value={"geo_idx": 0})
-        db.add(state)
-        db.flush()
 
     # If caller specifies scope(s), override geo batching.
     # _canonical_scope() now normalises "global"/"Global" → "Global" (matching ALLOWED_GEOS),
@@ -962,7 +1459,6 @@ def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run
     if scope_filters:
         geos_to_process = list(scope_filters)
     else:
-        geo_idx = int((state.value or {}).get("geo_idx") or 0)
         # If caller explicitly passed geo_list, we still only process 1 geo per run unless forced.
         force_all = _as_bool((params or {}).get("force_all"), False)
         if force_all:
@@ -970,260 +1466,92 @@ def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run
         else:
             if not geo_list:
                 geo_list = get_allowed_geos(db)
-            geos_to_process = [geo_list[geo_idx % len(geo_list)]]
-            state.value = {"geo_idx": (geo_idx + 1) % len(geo_list)}
-            state.updated_at = _now_utc()
+            geo_idx = _advance_insight_cursor(db, cursor_key, len(geo_list))
+            geos_to_process = [geo_list[geo_idx]]
 
     def want(card_key: str, tab_key: str, scope: str) -> bool:
         if card_filter and card_key != card_filter:
             return False
         if tab_filter and tab_key != tab_filter:
             return False
-        if scope_filters and _canonical_scope(scope) not in scope_filters:
+        if scope_filter_set and scope not in scope_filter_set:
             return False
         return True
 
-    # Public context URLs per card/tab (job-only fetch + DB cache)
-    URLS = {
-        ("trade_flow", "wci"): [
-            "https://www.drewry.co.uk/supply-chain-advisors/supply-chain-expertise/world-container-index-assessed-by-drewry",
-        ],
-        ("trade_flow", "portwatch"): [
-            "https://portwatch.imf.org/pages/data-and-methodology",
-        ],
-        ("trade_flow", "exim"): [
-            "https://data.worldbank.org/indicator/NE.EXP.GNFS.CD",
-            "https://data.worldbank.org/indicator/NE.IMP.GNFS.CD",
-        ],
-        ("wealth", "gdp_pc"): [
-            "https://data.worldbank.org/indicator/NY.GDP.PCAP.CD",
-        ],
-        ("wealth", "cons"): [
-            "https://data.worldbank.org/indicator/NE.CON.PRVT.CD",
-        ],
-        ("wealth", "age"): [
-            "https://data.worldbank.org/indicator/SP.POP.0014.TO.ZS",
-            "https://data.worldbank.org/indicator/SP.POP.1564.TO.ZS",
-            "https://data.worldbank.org/indicator/SP.POP.65UP.TO.ZS",
-        ],
-        ("wealth", "disp_pc"): [
-            "https://worldpopulationreview.com/country-rankings/disposable-income-by-country",
-            "https://data.worldbank.org/indicator/NE.CON.PRVT.PC.KD",
-        ],
-        ("wealth", "disp_hh"): [
-            "https://worldpopulationreview.com/country-rankings/disposable-income-by-country",
-            "https://data.worldbank.org/indicator/NE.CON.PRVT.PC.KD",
-        ],
-        ("finance", "industry"): [
-            "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-industries/",
-        ],
-        ("finance", "country"): [
-            "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-countries/",
-        ],
-    }
-
-    def ctx(card_key: str, tab_key: str) -> list[dict[str, Any]]:
-        blocks: list[dict[str, Any]] = []
-        for url in URLS.get((card_key, tab_key), []):
-            row = get_or_refresh_context(db, url=url)
-            blocks.append(to_prompt_block(row))
+    # Context blocks depend only on (card, tab), not on geo: resolve each once per run.
+    # Several tabs share URLs, so blocks are also memoized per URL.
+    ctx_cache: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    block_by_url: dict[str, dict[str, Any]] = {}
+
+    def ctx(context_key: tuple[str, str]) -> list[dict[str, Any]]:
+        blocks = ctx_cache.get(context_key)
+        if blocks is None:
+            urls = _INSIGHT_CONTEXT_URLS.get(context_key, ())
+            missing = [url for url in urls if url not in block_by_url]
+            if missing:
+                rows = get_or_refresh_contexts(db, missing)
+                block_by_url.update((url, to_prompt_block(rows[url])) for url in missing)
+            blocks = ctx_cache[context_key] = [block_by_url[url] for url in urls]
         return blocks
 
-    llm_attempted = 0
-    llm_failed: list[str] = []
-
-    def gen(
-        *,
-        card_key: str,
-        tab_key: str,
-        scope: str,
-        lang: str,
-        snapshot_inputs: list[WidgetSnapshot],
-        extra_context: dict[str, Any],
-        fallback_text: str,
-    ) -> None:
-        nonlocal llm_attempted
-        llm_attempted += 1
-        ok, err = _gen_insight(
-            db,
-            card_key=card_key,
-            tab_key=tab_key,
-            scope=scope,
-            lang=lang,
-            snapshot_inputs=snapshot_inputs,
-            extra_context=extra_context,
-            fallback_text=fallback_text,
-            job_run_id=job_run_id,
-        )
-        if not ok:
-            llm_failed.append(f"{card_key}/{tab_key}/{scope}: {err or 'llm generation failed'}")
-
-    # Trade (global tabs)
-    trade = get_latest_snapshot(db, "trade_corridors", "Global")
-    if trade:
-        if want("trade_flow", "corridors", "Global"):
-            gen(
-                card_key="trade_flow",
-                tab_key="corridors",
-                scope="Global",
-                lang=lang,
-                snapshot_inputs=[trade],
-                extra_context={"source": trade.source, "source_updated_at": trade.source_updated_at, "public_contexts": ctx("trade_flow", "corridors"), "force_regen": force_regen},
-                fallback_text="Top corridors are a directional signal; compare value vs volume leaders to spot reroutes or mix changes.",
-            )
-        if want("trade_flow", "wci", "Global"):
-            gen(
-                card_key="trade_flow",
-                tab_key="wci",
-                scope="Global",
-                lang=lang,
-                snapshot_inputs=[trade],
-                extra_context={"source": "Drewry WCI (scrape)", "note": "shipping cost proxy", "public_contexts": ctx("trade_flow", "wci"), "force_regen": force_regen},
-                fallback_text="Freight (WCI) reflects shipping-cost pressure; treat it as a proxy signal rather than customs trade value.",
-            )
-        if want("trade_flow", "portwatch", "Global"):
-            gen(
-                card_key="trade_flow",
-                tab_key="portwatch",
-                scope="Global",
-                lang=lang,
-                snapshot_inputs=[trade],
-                extra_context={"source": "IMF PortWatch", "note": "nowcast/proxy", "public_contexts": ctx("trade_flow", "portwatch"), "force_regen": force_regen},
-                fallback_text="PortWatch signals are nowcast/proxy indicators; always present them with explicit caveats.",
-            )
-
-    # Trade per-geo tabs
-    for geo in geos_to_process:
-        exim = get_latest_snapshot(db, "trade_exim_5y", geo)
-        if not exim:
-            continue
-        if want("trade_flow", "exim", geo):
-            gen(
-                card_key="trade_flow",
-                tab_key="exim",
-                scope=geo,
-                lang=lang,
-                snapshot_inputs=[exim],
-                extra_context={"geo": geo, "source": exim.source, "source_updated_at": exim.source_updated_at, "public_contexts": ctx("trade_flow", "exim"), "force_regen": force_regen},
-                fallback_text="Export/import snapshot is available; compare latest vs prior year to spot inflection points.",
-            )
-        if want("trade_flow", "balance", geo):
-            gen(
-                card_key="trade_flow",
-                tab_key="balance",
-                scope=geo,
-                lang=lang,
-                snapshot_inputs=[exim],
-                extra_context={"geo": geo, "definition": "balance = export - import", "public_contexts": ctx("trade_flow", "exim"), "force_regen": force_regen},
-                fallback_text="Trade balance is computed as export minus import; watch for large year-over-year moves.",
-            )
+    # Every snapshot this run can use, in one query instead of one lookup per (widget, geo).
+    latest = get_latest_snapshots_for_keys(
+        db, list(_INSIGHT_WIDGET_KEYS), scopes=sorted({"Global", *geos_to_process})
+    )
 
-    # Wealth per-geo
-    disp = get_latest_snapshot(db, "wealth_disposable_latest", "Global")
-    for geo in geos_to_process:
-        w = get_latest_snapshot(db, "wealth_indicators_5y", geo)
-        if w:
-            if want("wealth", "gdp_pc", geo):
-                gen(
-                    card_key="wealth",
-                    tab_key="gdp_pc",
-                    scope=geo,
+    # Collect every wanted insight first; the LLM calls are fanned out afterwards.
+    pending: list[InsightRequest] = []
+    for spec in _HOMEPAGE_INSIGHT_SPECS:
+        snaps = latest[spec.widget_key]
+        # Global-only snapshots feeding per-geo tabs: resolve their per-geo rows once.
+        geo_rows = _payload_rows(snaps.get("Global")) if spec.row_key else {}
+        for scope in geos_to_process if spec.per_geo else ("Global",):
+            snap = snaps.get("Global" if spec.global_snapshot else scope)
+            if snap is None or not want(spec.card_key, spec.tab_key, scope):
+                continue
+            extra_context: dict[str, Any] = dict(spec.static_context)
+            if spec.per_geo:
+                extra_context["geo"] = scope
+            if spec.row_key:
+                extra_context[spec.row_key] = geo_rows.get(scope)
+            if spec.snapshot_source:
+                extra_context["source"] = snap.source
+                extra_context["source_updated_at"] = snap.source_updated_at
+            extra_context["public_contexts"] = ctx(spec.context_key)
+            extra_context["force_regen"] = force_regen
+            pending.append(
+                _prepare_insight(
+                    card_key=spec.card_key,
+                    tab_key=spec.tab_key,
+                    scope=scope,
                     lang=lang,
-                    snapshot_inputs=[w],
-                    extra_context={"geo": geo, "source": w.source, "source_updated_at": w.source_updated_at, "public_contexts": ctx("wealth", "gdp_pc"), "force_regen": force_regen},
-                    fallback_text="GDP per capita (nominal USD) can be noisy due to FX; interpret trends with caveats.",
+                    snapshot_inputs=[snap],
+                    extra_context=extra_context,
                 )
-            if want("wealth", "cons", geo):
-                gen(
-                    card_key="wealth",
-                    tab_key="cons",
-                    scope=geo,
-                    lang=lang,
-                    snapshot_inputs=[w],
-                    extra_context={"geo": geo, "source": w.source, "source_updated_at": w.source_updated_at, "public_contexts": ctx("wealth", "cons"), "force_regen": force_regen},
-                    fallback_text="Consumption can proxy domestic-demand momentum; compare with trade signals for context.",
-                )
-
-        age = get_latest_snapshot(db, "wealth_age_structure_latest", geo)
-        if age and want("wealth", "age", geo):
-            gen(
-                card_key="wealth",
-                tab_key="age",
-                scope=geo,
-                lang=lang,
-                snapshot_inputs=[age],
-                extra_context={"geo": geo, "source": age.source, "source_updated_at": age.source_updated_at, "public_contexts": ctx("wealth", "age"), "force_regen": force_regen},
-                fallback_text="Age structure provides demographic context; treat it as population composition (not income-by-age).",
             )
 
-        # Disposable insights should follow geo (scope)
-        if disp:
-            # We do not have per-geo snapshots for disposable; we still generate per-geo insights
-            # by providing geo + per-geo row values in extra_context.
-            row = None
-            if isinstance(disp.payload, dict):
-                rows = disp.payload.get("rows")
-                if isinstance(rows, dict):
-                    row = rows.get(geo)
-            if want("wealth", "disp_pc", geo):
-                gen(
-                    card_key="wealth",
-                    tab_key="disp_pc",
-                    scope=geo,
-                    lang=lang,
-                    snapshot_inputs=[disp],
-                    extra_context={"geo": geo, "disposable_row": row, "source": disp.source, "source_updated_at": disp.source_updated_at, "public_contexts": ctx("wealth", "disp_pc"), "force_regen": force_regen},
-                    fallback_text="Disposable income is best-effort: WPR scrape + World Bank proxy fallback; treat as indicative latest point.",
-                )
-            if want("wealth", "disp_hh", geo):
-                gen(
-                    card_key="wealth",
-                    tab_key="disp_hh",
-                    scope=geo,
-                    lang=lang,
-                    snapshot_inputs=[disp],
-                    extra_context={"geo": geo, "disposable_row": row, "source": disp.source, "source_updated_at": disp.source_updated_at, "public_contexts": ctx("wealth", "disp_hh"), "force_regen": force_regen},
-                    fallback_text="Household disposable values may be missing; consider OECD SDMX where coverage exists.",
-                )
-
-    # Finance (global)
-    fin_i = get_latest_snapshot(db, "finance_ma_industry", "Global")
-    if fin_i and want("finance", "industry", "Global"):
-        gen(
-            card_key="finance",
-            tab_key="industry",
-            scope="Global",
-            lang=lang,
-            snapshot_inputs=[fin_i],
-            extra_context={"source": fin_i.source, "source_updated_at": fin_i.source_updated_at, "public_contexts": ctx("finance", "industry"), "force_regen": force_regen},
-            fallback_text="Industry ranking reflects disclosed-deal reporting; treat as directional concentration of activity.",
-        )
-
-    fin_c = get_latest_snapshot(db, "finance_ma_country", "Global")
-    if fin_c and want("finance", "country", "Global"):
-        gen(
-            card_key="finance",
-            tab_key="country",
-            scope="Global",
-            lang=lang,
-            snapshot_inputs=[fin_c],
-            extra_context={"source": fin_c.source, "source_updated_at": fin_c.source_updated_at, "public_contexts": ctx("finance", "country"), "force_regen": force_regen},
-            fallback_text="Country narratives may mix currencies; use normalized FX conversion for strict comparisons.",
-        )
+    skipped_unchanged = 0
+    if not force_regen:
+        latest_digests = _latest_insight_digests(db, pending)
+        fresh = [r for r in pending if latest_digests.get((r.card_key, r.tab_key, r.scope, r.lang)) != r.data_digest]
+        skipped_unchanged = len(pending) - len(fresh)
+        pending = fresh
+
+    llm_attempted = len(pending)
+    llm_failed = [
+        f"{req.card_key}/{req.tab_key}/{req.scope}: {err or 'llm generation failed'}"
+        for req, ok, err in _generate_insights(db, pending, job_run_id)
+        if not ok
+    ]
 
-    after_count = (
-        db.query(func.count(WidgetInsight.id))
-        .filter(WidgetInsight.generated_by == "llm")
-        .scalar()
-        or 0
-    )
-    added = int(after_count) - int(before_count)
     failed = len(llm_failed)
+    # Every successful generation adds exactly one insight row.
+    added = llm_attempted - failed
     if llm_attempted > 0 and failed == llm_attempted:
         raise RuntimeError("all LLM insight generations failed: " + " | ".join(llm_failed[:5]))
     msg = (
         f"homepage insights saved: +{added}, attempted={llm_attempted}, "
-        f"failed={failed}, purged_non_llm={int(purged_non_llm)}"
+        f"failed={failed}, skipped_unchanged={skipped_unchanged}, purged_non_llm={int(purged_non_llm)}"
     )
     if llm_failed:
         msg += " (partial llm failures logged)"
@@ -1234,7 +1562,7 @@ def _run_generate_homepage_insights(db: Session, params: dict[str, Any], job_run
 # Executive Insight — manual-only job that synthesises ALL dashboard data
 # ---------------------------------------------------------------------------
 
-def _normalize_generate_executive_insight(raw: dict[str, Any]) -> dict[str, Any]:
+def _normalize_generate_executive_insight(raw: dict[str, Any], db: Session | None = None) -> dict[str, Any]:
     lang = str(raw.get("lang") or "en").strip().lower() or "en"
     return {
         "lang": lang,
@@ -1251,14 +1579,15 @@ def _run_generate_executive_insight(db: Session, params: dict[str, Any], job_run
     tab_key = "summary"
     scope = "Global"
 
-    # Gather every snapshot the dashboard uses
-    trade = get_latest_snapshot(db, "trade_corridors", "Global")
-    trade_exim = get_latest_snapshots_by_key(db, "trade_exim_5y")
-    wealth_ind = get_latest_snapshots_by_key(db, "wealth_indicators_5y")
-    wealth_disp = get_latest_snapshot(db, "wealth_disposable_latest", "Global")
-    wealth_age = get_latest_snapshots_by_key(db, "wealth_age_structure_latest")
-    fin_ind = get_latest_snapshot(db, "finance_ma_industry", "Global")
-    fin_cty = get_latest_snapshot(db, "finance_ma_country", "Global")
+    # Gather every snapshot the dashboard uses (one query for all widgets)
+    latest = get_latest_snapshots_for_keys(db, list(_INSIGHT_WIDGET_KEYS))
+    trade = latest["trade_corridors"].get("Global")
+    trade_exim = latest["trade_exim_5y"]
+    wealth_ind = latest["wealth_indicators_5y"]
+    wealth_disp = latest["wealth_disposable_latest"].get("Global")
+    wealth_age = latest["wealth_age_structure_latest"]
+    fin_ind = latest["finance_ma_industry"].get("Global")
+    fin_cty = latest["finance_ma_country"].get("Global")
 
     snapshot_inputs: list[WidgetSnapshot] = []
     if trade:
@@ -1329,7 +1658,7 @@ def _run_generate_executive_insight(db: Session, params: dict[str, Any], job_run
         "Return STRICT JSON with keys: insight (string), references (array of {title,url,publisher,date})."
     )
 
-    user = json.dumps(
+    user = stable_json_dumps(
         {
             "task": "Generate holistic Executive Insight for leadership dashboard",
             "audience": ["C-suite", "senior executives", "economic analysts"],
@@ -1346,10 +1675,7 @@ def _run_generate_executive_insight(db: Session, params: dict[str, Any], job_run
                 "json_max_chars": 10000,
             },
             "inputs": input_obj,
-        },
-        ensure_ascii=False,
-        sort_keys=True,
-        default=str,
+        }
     )
 
     llm = generate_insight_with_llm(system=system, user=user)
@@ -1510,32 +1836,66 @@ JOB_SPECS: dict[str, JobSpec] = {
 }
 
 
+# JOB_SPECS is fixed at import time and run_job_now rejects unknown ids before locking,
+# so every lock exists up front and this dict is read-only afterwards: no creation race.
+# Locks stay one-per-job rather than striped: run_job_now skips on a held lock, so a
+# shared stripe would make unrelated jobs report "already running".
+_LOCKS: dict[str, threading.Lock] = {job_id: threading.Lock() for job_id in JOB_SPECS}
+
+
 def _seed_job_definitions(db: Session) -> None:
-    for spec in JOB_SPECS.values():
-        row = db.get(JobDefinition, spec.job_id)
-        if row is None:
-            db.add(
-                JobDefinition(
-                    job_id=spec.job_id,
-                    name=spec.name,
-                    description=spec.description,
-                    cron_expr=spec.cron_expr,
-                    timezone=spec.timezone,
-                    enabled=True,
-                    default_params=spec.default_params,
-                )
-            )
-    db.commit()
+    # One IN (...) lookup instead of a db.get() round-trip per spec.
+    existing = {
+        job_id
+        for (job_id,) in db.query(JobDefinition.job_id).filter(JobDefinition.job_id.in_(list(JOB_SPECS))).all()
+    }
+    new_rows = [
+        JobDefinition(
+            job_id=spec.job_id,
+            name=spec.name,
+            description=spec.description,
+            cron_expr=spec.cron_expr,
+            timezone=spec.timezone,
+            enabled=True,
+            default_params=spec.default_params,
+        )
+        for job_id, spec in JOB_SPECS.items()
+        if job_id not in existing
+    ]
+    # Nothing to write is the usual case on restart: skip the COMMIT round-trip.
+    if new_rows:
+        db.add_all(new_rows)
+        db.commit()
+
 
+def data_version() -> int:
+    """Counter that changes whenever a job run has committed (snapshots/insights may differ)."""
+    return _DATA_VERSION
 
-def _get_lock(job_id: str) -> threading.Lock:
-    if job_id not in _LOCKS:
-        _LOCKS[job_id] = threading.Lock()
-    return _LOCKS[job_id]
+
+def _bump_data_version() -> None:
+    global _DATA_VERSION
+    with _DATA_VERSION_LOCK:
+        _DATA_VERSION += 1
+
+
+def _ensure_job_definitions_seeded(db: Session, *, force: bool = False) -> None:
+    """Seed missing job definitions once per process (JOB_SPECS is immutable at runtime)."""
+    global _SEEDED
+    if _SEEDED and not force:
+        return
+    with _SEED_LOCK:
+        if _SEEDED and not force:
+            return
+        _seed_job_definitions(db)
+        _SEEDED = True
 
 
 def run_job_now(job_id: str, params_override: dict[str, Any] | None = None, triggered_by: str = "manual") -> dict[str, Any]:
-    if job_id not in JOB_SPECS:
+    # Everything up to the lock acquisition is in-memory: a contended or invalid call must
+    # return without checking out a DB connection.
+    spec = JOB_SPECS.get(job_id)
+    if spec is None:
         return {"ok": False, "job_id": job_id, "status": "failed", "error": "unknown job"}
 
     if not settings.JOBS_ENABLED:
@@ -1549,7 +1909,7 @@ def run_job_now(job_id: str, params_override: dict[str, Any] | None = None, trig
     if triggered_by not in JOB_RUN_BY:
         triggered_by = "manual"
 
-    lock = _get_lock(job_id)
+    lock = _LOCKS[job_id]
     if not lock.acquire(blocking=False):
         return {"ok": False, "job_id": job_id, "status": "skipped", "message": "job is already running"}
 
@@ -1560,17 +1920,21 @@ def run_job_now(job_id: str, params_override: dict[str, Any] | None = None, trig
     message = ""
 
     try:
-        with SessionLocal() as db:
-            _seed_job_definitions(db)
-            spec = JOB_SPECS[job_id]
+        # run/job_def are not re-read after commit; skip expiry so nothing triggers a reload SELECT.
+        with SessionLocal(expire_on_commit=False) as db:
+            _ensure_job_definitions_seeded(db)
             job_def = db.get(JobDefinition, job_id)
+            if job_def is None:
+                # Row was removed out-of-band after this process seeded; re-seed once.
+                _ensure_job_definitions_seeded(db, force=True)
+                job_def = db.get(JobDefinition, job_id)
             if job_def is None:
                 raise RuntimeError(f"job definition not found: {job_id}")
 
             raw = dict(job_def.default_params or {})
             if params_override:
                 raw.update(params_override)
-            params = spec.normalize_params(raw)
+            params = spec.normalize_params(raw, db)
 
             run = JobRun(
                 job_id=job_id,
@@ -1580,28 +1944,29 @@ def run_job_now(job_id: str, params_override: dict[str, Any] | None = None, trig
                 started_at=started,
             )
             db.add(run)
-            db.flush()
-            run_id = int(run.id)
-
             job_def.last_scheduled_at = started
+            # One flush sends both the JobRun INSERT (populating run.id) and the job_def UPDATE.
             db.flush()
+            run_id = int(run.id)
 
             try:
                 message = spec.runner(db, params, run_id)
                 status = "success"
-                job_def.last_success_at = _now_utc()
             except Exception as exc:  # noqa: BLE001
                 status = "failed"
                 error = str(exc)
                 message = "job failed"
 
             finished = _now_utc()
+            if status == "success":
+                job_def.last_success_at = finished
             run.status = status
             run.message = message
             run.error = error
             run.finished_at = finished
             run.duration_ms = int((finished - started).total_seconds() * 1000)
             db.commit()
+            _bump_data_version()
     finally:
         lock.release()
 
@@ -1615,18 +1980,32 @@ def run_job_now(job_id: str, params_override: dict[str, Any] | None = None, trig
     }
 
 
+@functools.lru_cache(maxsize=128)
+def _build_trigger(cron_expr: str, tz: str) -> CronTrigger:
+    # Keyed by immutable inputs and CronTrigger holds no per-job state, so no invalidation needed.
+    return CronTrigger.from_crontab(cron_expr, timezone=tz)
+
+
+async def _arun_job_now(
+    job_id: str, params_override: dict[str, Any] | None = None, triggered_by: str = "scheduler"
+) -> dict[str, Any]:
+    # Runners are blocking (urllib + sync SQLAlchemy); keep them off the event loop.
+    return await asyncio.to_thread(run_job_now, job_id, params_override, triggered_by)
+
+
 def init_scheduler() -> None:
     global _SCHEDULER
     with _SCHED_LOCK:
         if _SCHEDULER is not None:
             return
         with SessionLocal() as db:
-            _seed_job_definitions(db)
+            _ensure_job_definitions_seeded(db)
 
         if not settings.JOBS_ENABLED:
             return
 
-        scheduler = BackgroundScheduler(timezone=settings.TZ)
+        # Must be called from the app lifespan so the scheduler binds to uvicorn's running loop.
+        scheduler = AsyncIOScheduler(timezone=settings.TZ)
         scheduler.start()
         _SCHEDULER = scheduler
         reload_scheduler_jobs()
@@ -1640,40 +2019,80 @@ def shutdown_scheduler() -> None:
             return
         _SCHEDULER.shutdown(wait=False)
         _SCHEDULER = None
+        with _RELOAD_LOCK:
+            _JOB_STATE.clear()
 
 
 def reload_scheduler_jobs() -> None:
+    """Reconcile scheduled cron jobs with job_definitions.
+
+    Only jobs whose (cron_expr, timezone) changed, or that were enabled/disabled, are
+    touched; warmup jobs and unchanged schedules are left alone.
+    """
     scheduler = _SCHEDULER
     if scheduler is None:
         return
 
-    scheduler.remove_all_jobs()
-
     with SessionLocal() as db:
         rows = (
-            db.query(JobDefinition)
+            db.query(JobDefinition.job_id, JobDefinition.enabled, JobDefinition.cron_expr, JobDefinition.timezone)
             .order_by(JobDefinition.job_id.asc())
             .all()
         )
 
-    for row in rows:
-        if not row.enabled:
+    desired: dict[str, tuple[str, str, CronTrigger]] = {}
+    for job_id, enabled, cron_expr, timezone_name in rows:
+        if not enabled:
             continue
+        tz = timezone_name or settings.TZ
         try:
-            trigger = CronTrigger.from_crontab(row.cron_expr, timezone=row.timezone or settings.TZ)
+            trigger = _build_trigger(cron_expr, tz)
         except Exception:
             continue
-        misfire_grace_time = 3600 if row.job_id == "generate_homepage_insights" else 120
-        scheduler.add_job(
-            run_job_now,
-            trigger=trigger,
-            id=f"job:{row.job_id}",
-            replace_existing=True,
-            max_instances=1,
-            coalesce=True,
-            misfire_grace_time=misfire_grace_time,
-            args=[row.job_id, None, "scheduler"],
-        )
+        desired[job_id] = (cron_expr, tz, trigger)
+
+    with _RELOAD_LOCK:
+        for job_id in list(_JOB_STATE):
+            if job_id in desired:
+                continue
+            try:
+                scheduler.remove_job(f"job:{job_id}")
+            except JobLookupError:
+                pass
+            del _JOB_STATE[job_id]
+
+        for job_id, (cron_expr, tz, trigger) in desired.items():
+            if _JOB_STATE.get(job_id) == (cron_expr, tz) and scheduler.get_job(f"job:{job_id}") is not None:
+                continue
+            misfire_grace_time = 3600 if job_id == "generate_homepage_insights" else 120
+            scheduler.add_job(
+                _arun_job_now,
+                trigger=trigger,
+                id=f"job:{job_id}",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=misfire_grace_time,
+                args=[job_id, None, "scheduler"],
+            )
+            _JOB_STATE[job_id] = (cron_expr, tz)
+
+
+def _request_scheduler_reload(delay_seconds: int = 1) -> None:
+    """Coalesce reload requests into one deferred reconciliation.
+
+    Each call replaces the pending one-off job, so a burst of definition edits triggers a
+    single reload_scheduler_jobs() run on a scheduler worker instead of the request thread.
+    """
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return
+    scheduler.add_job(
+        reload_scheduler_jobs,
+        id="reload:job_definitions",
+        replace_existing=True,
+        next_run_time=_now_utc() + timedelta(seconds=delay_seconds),
+    )
 
 
 def _schedule_startup_warmup() -> None:
@@ -1681,27 +2100,30 @@ def _schedule_startup_warmup() -> None:
     if scheduler is None or not settings.JOB_WARMUP_ON_START:
         return
     with SessionLocal() as db:
-        has_any = db.query(func.count(WidgetSnapshot.id)).scalar() or 0
+        has_any = db.query(WidgetSnapshot.id).limit(1).first() is not None
     if has_any:
         return
 
-    warmup_jobs = [job_id for job_id in JOB_SPECS if job_id not in {"cleanup_snapshots", "generate_homepage_insights"}]
-    warmup_jobs.append("generate_homepage_insights")
-
-    delay_seconds = 2
-    for job_id in warmup_jobs:
-        run_at = _now_utc() + timedelta(seconds=delay_seconds)
-        if job_id == "generate_homepage_insights":
-            # Run insight generation after upstream snapshot jobs have had time to materialize.
-            run_at = _now_utc() + timedelta(seconds=max(delay_seconds, 90))
-        scheduler.add_job(
-            run_job_now,
-            id=f"warmup:{job_id}",
-            replace_existing=True,
-            next_run_time=run_at,
-            args=[job_id, None, "startup"],
-        )
-        delay_seconds += 2
+    scheduler.add_job(
+        _arun_startup_warmup,
+        id="warmup:startup",
+        replace_existing=True,
+        next_run_time=_now_utc() + timedelta(seconds=2),
+    )
+
+
+# Insight jobs read the latest snapshots, so on warmup they wait for the snapshot jobs.
+_WARMUP_INSIGHT_JOBS = ("generate_homepage_insights", "generate_executive_insight")
+_WARMUP_SNAPSHOT_JOBS = tuple(
+    job_id for job_id in JOB_SPECS if job_id != "cleanup_snapshots" and job_id not in _WARMUP_INSIGHT_JOBS
+)
+
+
+async def _arun_startup_warmup() -> None:
+    # Snapshot jobs are independent and I/O-bound: run them side by side, then the insight
+    # jobs once they have all finished (failures included, so one bad source can't block them).
+    await asyncio.gather(*(_arun_job_now(job_id, None, "startup") for job_id in _WARMUP_SNAPSHOT_JOBS), return_exceptions=True)
+    await asyncio.gather(*(_arun_job_now(job_id, None, "startup") for job_id in _WARMUP_INSIGHT_JOBS), return_exceptions=True)
 
 
 def get_next_run_time(job_id: str) -> datetime | None:
@@ -1718,13 +2140,27 @@ def list_job_definitions(db: Session) -> list[JobDefinition]:
     return db.query(JobDefinition).order_by(JobDefinition.job_id.asc()).all()
 
 
-def list_recent_job_runs(db: Session, limit: int = 100) -> list[JobRun]:
-    return (
-        db.query(JobRun)
+def list_recent_job_runs(db: Session, limit: int = 100) -> list[Row[Any]]:
+    """Recent runs as lightweight Core rows (read-only listing; no ORM hydration).
+
+    Rows expose the selected columns as attributes, so templates read them like JobRun.
+    """
+    stmt = (
+        select(
+            JobRun.id,
+            JobRun.job_id,
+            JobRun.status,
+            JobRun.triggered_by,
+            JobRun.message,
+            JobRun.error,
+            JobRun.started_at,
+            JobRun.finished_at,
+            JobRun.duration_ms,
+        )
         .order_by(desc(JobRun.started_at))
         .limit(limit)
-        .all()
     )
+    return list(db.execute(stmt).all())
 
 
 def update_job_definition(
@@ -1745,43 +2181,78 @@ def update_job_definition(
     cron_expr = (cron_expr or "").strip()
     timezone_name = (timezone_name or "").strip() or settings.TZ
     try:
-        CronTrigger.from_crontab(cron_expr, timezone=timezone_name)
+        _build_trigger(cron_expr, timezone_name)
     except Exception as exc:  # noqa: BLE001
         return False, f"invalid cron/timezone: {exc}"
 
     spec = JOB_SPECS[job_id]
-    normalized = spec.normalize_params(default_params or {})
+    normalized = spec.normalize_params(default_params or {}, db)
     row.cron_expr = cron_expr
     row.timezone = timezone_name
     row.enabled = enabled
     row.default_params = normalized
     db.commit()
-    reload_scheduler_jobs()
+    _request_scheduler_reload()
     return True, "updated"
 
 
-def get_latest_snapshot(db: Session, widget_key: str, scope: str = "Global") -> WidgetSnapshot | None:
-    return (
-        db.query(WidgetSnapshot)
-        .filter(WidgetSnapshot.widget_key == widget_key, WidgetSnapshot.scope == scope)
-        .order_by(desc(WidgetSnapshot.fetched_at))
-        .first()
+# Built once at import; per-call values are bound at execute time so the compiled form is
+# served from the engine's statement cache.
+_LATEST_SNAPSHOT_STMT = (
+    select(WidgetSnapshot)
+    .where(
+        WidgetSnapshot.widget_key == bindparam("widget_key"),
+        WidgetSnapshot.scope == bindparam("scope"),
     )
+    .order_by(desc(WidgetSnapshot.fetched_at))
+    .limit(1)
+)
+
+
+def get_latest_snapshot(db: Session, widget_key: str, scope: str = "Global") -> WidgetSnapshot | None:
+    return db.execute(_LATEST_SNAPSHOT_STMT, {"widget_key": widget_key, "scope": scope}).scalars().first()
 
 
 def get_latest_snapshots_by_key(db: Session, widget_key: str) -> dict[str, WidgetSnapshot]:
+    # Postgres DISTINCT ON keeps only the newest row per scope server-side, so we never
+    # hydrate the full snapshot history for this widget.
     rows = (
         db.query(WidgetSnapshot)
         .filter(WidgetSnapshot.widget_key == widget_key)
+        .distinct(WidgetSnapshot.scope)
         .order_by(WidgetSnapshot.scope.asc(), desc(WidgetSnapshot.fetched_at))
         .all()
     )
-    out: dict[str, WidgetSnapshot] = {}
+    return {row.scope: row for row in rows}
+
+
+def get_latest_snapshots_for_keys(
+    db: Session, widget_keys: list[str], scopes: list[str] | None = None
+) -> dict[str, dict[str, WidgetSnapshot]]:
+    """Newest snapshot per scope for several widgets, as {widget_key: {scope: snapshot}}.
+
+    One DISTINCT ON (widget_key, scope) query instead of a lookup per widget; scopes
+    come back in ascending order, matching get_latest_snapshots_by_key(). ``scopes``
+    optionally restricts which scopes are loaded.
+    """
+    out: dict[str, dict[str, WidgetSnapshot]] = {key: {} for key in widget_keys}
+    q = db.query(WidgetSnapshot).filter(WidgetSnapshot.widget_key.in_(widget_keys))
+    if scopes is not None:
+        q = q.filter(WidgetSnapshot.scope.in_(scopes))
+    rows = (
+        q.distinct(WidgetSnapshot.widget_key, WidgetSnapshot.scope)
+        .order_by(WidgetSnapshot.widget_key, WidgetSnapshot.scope.asc(), desc(WidgetSnapshot.fetched_at))
+        .all()
+    )
     for row in rows:
-        if row.scope not in out:
-            out[row.scope] = row
+        out[row.widget_key].setdefault(row.scope, row)
     return out
 
 
 def parse_params_json(raw: str | None, fallback: dict[str, Any] | None = None) -> dict[str, Any]:
-    return _parse_json_object(raw, fallback=fallback)
+    if raw is None or raw.strip() == "":
+        return fallback or {}
+    data = _loads_params_cached(raw)
+    if data is None:
+        return fallback or {}
+    return dict(data)
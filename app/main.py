@@ -3,20 +3,25 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.jobs import init_scheduler, shutdown_scheduler
 from app.web.routes import router as web_router
+from app.web.visits import start_visit_writer, stop_visit_writer
 
 favicon_path = Path("app/web/static/favicon.ico")
+# The icon ships with the image: stat it once here instead of on every request.
+_FAVICON_STAT = favicon_path.stat() if favicon_path.is_file() else None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_scheduler()
+    start_visit_writer()
     yield
+    stop_visit_writer()
     shutdown_scheduler()
 
 
@@ -43,7 +48,7 @@ app.include_router(web_router)
 
 @app.get("/favicon.ico")
 def favicon():
-    if favicon_path.exists():
-        return FileResponse(favicon_path)
-    # Avoid FileResponse on /dev/null (not a regular file in some containers)
-    return ""
+    if _FAVICON_STAT is None:
+        return Response(status_code=204)
+    # A fresh response per request: FileResponse keeps per-request (Range) state on itself.
+    return FileResponse(favicon_path, stat_result=_FAVICON_STAT)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import hmac
+import secrets
+import struct
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from passlib.context import CryptContext
 
+from app.config import settings
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -19,34 +27,42 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Session token: base64url(struct(user_id, expires_at) + truncated HMAC-SHA256).
+_TOKEN_STRUCT = struct.Struct(">QQ")
+_TOKEN_MAC_SIZE = 16
+_TOKEN_SIZE = _TOKEN_STRUCT.size + _TOKEN_MAC_SIZE
+_SESSION_KEY = settings.SESSION_SECRET.encode() if settings.SESSION_SECRET else secrets.token_bytes(32)
+
+
+def _token_mac(payload: bytes) -> bytes:
+    return hmac.new(_SESSION_KEY, payload, hashlib.sha256).digest()[:_TOKEN_MAC_SIZE]
+
+
 def create_session_token(user_id: int, expires_delta: timedelta | None = None) -> str:
-    """Create a simple session token containing user_id and expiration."""
+    """Create a signed session token containing user_id and expiration."""
     if expires_delta is None:
         expires_delta = timedelta(days=7)  # Default 7 days
-    
+
     expire = datetime.now(timezone.utc) + expires_delta
-    # Simple format: user_id:expiration_timestamp
-    token_data = f"{user_id}:{int(expire.timestamp())}"
-    return token_data
+    payload = _TOKEN_STRUCT.pack(user_id, int(expire.timestamp()))
+    return base64.urlsafe_b64encode(payload + _token_mac(payload)).rstrip(b"=").decode("ascii")
 
 
 def decode_session_token(token: str) -> dict[str, Any] | None:
-    """Decode a session token and return user info if valid."""
+    """Decode a session token and return user info if valid (signature checked, not expired)."""
     try:
-        parts = token.split(":")
-        if len(parts) != 2:
-            return None
-        
-        user_id = int(parts[0])
-        expire_timestamp = int(parts[1])
-        
-        # Check if expired
-        now = datetime.now(timezone.utc)
-        expire = datetime.fromtimestamp(expire_timestamp, tz=timezone.utc)
-        
-        if now > expire:
-            return None
-        
-        return {"user_id": user_id}
-    except (ValueError, IndexError):
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
         return None
+    if len(raw) != _TOKEN_SIZE:
+        return None
+
+    payload, mac = raw[: _TOKEN_STRUCT.size], raw[_TOKEN_STRUCT.size :]
+    if not hmac.compare_digest(mac, _token_mac(payload)):
+        return None
+
+    user_id, expire_timestamp = _TOKEN_STRUCT.unpack(payload)
+    if time.time() > expire_timestamp:
+        return None
+
+    return {"user_id": user_id}
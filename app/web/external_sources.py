@@ -6,16 +6,48 @@ import time
 import html as _html
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+# Scheduled refreshes hit the same upstream hosts repeatedly; reuse keep-alive connections.
+from app.http_pool import conditional_headers, urlopen_unless_not_modified
 
 
 DREWRY_WCI_URL = "https://www.drewry.co.uk/supply-chain-advisors/supply-chain-expertise/world-container-index-assessed-by-drewry"
 
+# Parse patterns, compiled once at import rather than looked up in re's cache on every call.
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_WS = re.compile(r"\s+")
+_RE_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_USD_AMOUNT = r"([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)"
+_RE_WCI_PERIOD = re.compile(r"World\s+Container\s+Index\s*-\s*(\d{1,2}\s+[A-Za-z]{3})", re.IGNORECASE)
+_RE_WCI_HEADLINE = re.compile(
+    r"World\s+Container\s+Index\s+(?:increased|decreased)\s+([0-9]+)%\s+to\s*\$\s*" + _USD_AMOUNT + r"\s*per\s*40ft",
+    re.IGNORECASE,
+)
+_RE_WCI_VALUE = re.compile(r"to\s*\$\s*" + _USD_AMOUNT + r"\s*per\s*40ft", re.IGNORECASE)
+_WCI_LANE_PATTERNS = tuple(
+    (name, re.compile(lane + r".*?(?:dropping|rising)\s*([0-9]+)%\s*to\s*\$\s*" + _USD_AMOUNT, re.IGNORECASE | re.DOTALL))
+    for name, lane in (
+        ("Shanghai→Los Angeles", r"Los Angeles"),
+        ("Shanghai→New York", r"New York"),
+        ("Shanghai→Rotterdam", r"Shanghai[–-]Rotterdam"),
+        ("Shanghai→Genoa", r"Shanghai[–-]Genoa"),
+    )
+)
+_RE_WCI_ASSESSMENT = re.compile(
+    r"Our detailed assessment.*?(The\s+Drewry.*?)(?:Related Research|Featured Services)", re.IGNORECASE | re.DOTALL
+)
+_RE_WCI_EXPECTATION = re.compile(r"Hence, we expect.*?\.|Drewry expects.*?\.\s*", re.IGNORECASE)
+
 
 @dataclass
 class _CacheEntry:
     value: Dict[str, Any]
     expires_at: float
+    # Validators from the upstream response, re-sent as a conditional GET once the entry expires.
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 
 # Very small in-process cache to avoid hammering upstream.
@@ -31,15 +63,22 @@ def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     return e.value
 
 
-def _set_cached(key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
-    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+def _set_cached(
+    key: str,
+    value: Dict[str, Any],
+    ttl_seconds: int,
+    *,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds, etag=etag, last_modified=last_modified)
 
 
 def _strip_html(s: str) -> str:
     # Remove tags and decode entities; keep it simple and dependency-free.
-    s = re.sub(r"<[^>]+>", " ", s)
+    s = _RE_TAG.sub(" ", s)
     s = _html.unescape(s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_WS.sub(" ", s).strip()
     return s
 
 
@@ -50,7 +89,7 @@ def _shorten_text(s: str, max_chars: int = 260, max_sentences: int = 2) -> str:
 
     # Prefer keeping the first N sentences.
     # Split on ". " while keeping simple abbreviations risk acceptable for MVP.
-    parts = re.split(r"(?<=[.!?])\s+", s)
+    parts = _RE_SENTENCE_END.split(s)
     if len(parts) > 1:
         s2 = " ".join(parts[:max_sentences]).strip()
     else:
@@ -75,17 +114,18 @@ def fetch_drewry_wci(ttl_seconds: int = 6 * 60 * 60, force: bool = False) -> Dic
     if cached:
         return {**cached, "cached": True}
 
-    req = Request(
-        DREWRY_WCI_URL,
-        headers={
-            "User-Agent": "GTA (Global Trade Analysis) dashboard bot; contact: admin",
-            "Accept": "text/html,application/xhtml+xml",
-        },
-    )
+    # The page changes weekly: revalidate the previous copy so an unchanged page costs a 304.
+    prev = _CACHE.get(cache_key)
+    headers = {
+        "User-Agent": "GTA (Global Trade Analysis) dashboard bot; contact: admin",
+        "Accept": "text/html,application/xhtml+xml",
+    }
+    if prev is not None:
+        headers.update(conditional_headers(prev.etag, prev.last_modified))
+    req = Request(DREWRY_WCI_URL, headers=headers)
 
     try:
-        with urlopen(req, timeout=10) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
+        fetched = urlopen_unless_not_modified(req, timeout=10)
     except Exception as e:
         # Fall back to stale cached value if present.
         stale = _CACHE.get(cache_key)
@@ -99,10 +139,15 @@ def fetch_drewry_wci(ttl_seconds: int = 6 * 60 * 60, force: bool = False) -> Dic
             "commentary": "Fetch failed; showing placeholder.",
             "error": str(e),
         }
+    if fetched is None and prev is not None:
+        prev.expires_at = time.time() + ttl_seconds
+        return {**prev.value, "cached": True, "revalidated": True}
+    body, etag, last_modified = fetched or (b"", None, None)
+    html = body.decode("utf-8", errors="ignore")
 
     # Extract period from title-like text: "World Container Index - 05 Feb"
     period = None
-    m_period = re.search(r"World\s+Container\s+Index\s*-\s*(\d{1,2}\s+[A-Za-z]{3})", html, re.IGNORECASE)
+    m_period = _RE_WCI_PERIOD.search(html)
     if m_period:
         period = m_period.group(1)
 
@@ -111,30 +156,20 @@ def fetch_drewry_wci(ttl_seconds: int = 6 * 60 * 60, force: bool = False) -> Dic
     direction = None  # 'up' | 'down'
     change_pct = None
 
-    m_headline = re.search(
-        r"World\s+Container\s+Index\s+(?:increased|decreased)\s+([0-9]+)%\s+to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)\s*per\s*40ft",
-        html,
-        re.IGNORECASE,
-    )
+    m_headline = _RE_WCI_HEADLINE.search(html)
     if m_headline:
         change_pct = int(m_headline.group(1))
         value = int(m_headline.group(2).replace(",", ""))
         direction = "down" if "decreased" in m_headline.group(0).lower() else "up"
     else:
-        m_value = re.search(r"to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)\s*per\s*40ft", html, re.IGNORECASE)
+        m_value = _RE_WCI_VALUE.search(html)
         if m_value:
             value = int(m_value.group(1).replace(",", ""))
 
     # Extract a few lane quotes if present (best-effort)
     lanes = []
-    lane_patterns = [
-        ("Shanghai→Los Angeles", r"Los Angeles.*?(?:dropping|rising)\s*([0-9]+)%\s*to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)"),
-        ("Shanghai→New York", r"New York.*?(?:dropping|rising)\s*([0-9]+)%\s*to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)"),
-        ("Shanghai→Rotterdam", r"Shanghai[–-]Rotterdam.*?(?:dropping|rising)\s*([0-9]+)%\s*to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)"),
-        ("Shanghai→Genoa", r"Shanghai[–-]Genoa.*?(?:dropping|rising)\s*([0-9]+)%\s*to\s*\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)"),
-    ]
-    for name, pat in lane_patterns:
-        m = re.search(pat, html, re.IGNORECASE | re.DOTALL)
+    for name, pat in _WCI_LANE_PATTERNS:
+        m = pat.search(html)
         if m:
             pct = int(m.group(1))
             price = int(m.group(2).replace(",", ""))
@@ -143,13 +178,13 @@ def fetch_drewry_wci(ttl_seconds: int = 6 * 60 * 60, force: bool = False) -> Dic
 
     # Extract assessment paragraph (best-effort)
     assessment = None
-    m_assess = re.search(r"Our detailed assessment.*?(The\s+Drewry.*?)(?:Related Research|Featured Services)", html, re.IGNORECASE | re.DOTALL)
+    m_assess = _RE_WCI_ASSESSMENT.search(html)
     if m_assess:
         assessment = _shorten_text(_strip_html(m_assess.group(1)))
 
     # Extract expectation sentence if present
     expectation = None
-    m_expect = re.search(r"Hence, we expect.*?\.|Drewry expects.*?\.\s*", html, re.IGNORECASE)
+    m_expect = _RE_WCI_EXPECTATION.search(html)
     if m_expect:
         expectation = _strip_html(m_expect.group(0))
 
@@ -186,5 +221,5 @@ def fetch_drewry_wci(ttl_seconds: int = 6 * 60 * 60, force: bool = False) -> Dic
         "analysis_commentary": analysis_commentary,
     }
 
-    _set_cached(cache_key, payload, ttl_seconds=ttl_seconds)
+    _set_cached(cache_key, payload, ttl_seconds=ttl_seconds, etag=etag, last_modified=last_modified)
     return {**payload, "cached": False}
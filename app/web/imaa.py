@@ -5,17 +5,32 @@ import time
 import html as _html
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+# Both IMAA pages live on one host; reuse keep-alive connections across fetches.
+from app.http_pool import conditional_headers, urlopen_unless_not_modified
 
 
 IMAA_INDUSTRY_URL = "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-industries/"
 IMAA_COUNTRY_URL = "https://imaa-institute.org/mergers-and-acquisitions-statistics/ma-statistics-by-countries/"
 
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_WS = re.compile(r"\s+")
+_RE_TR = re.compile(r"<tr[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_RE_TD = re.compile(r"<td[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+_RE_COUNTRY_HEADING = re.compile(r"<h[23][^>]*>\s*(M&amp;A|M&A)\s+([^<]+)</h[23]>", re.IGNORECASE)
+_RE_COUNTRY_TOTALS = re.compile(
+    r"Since\s+(\d{4}).{0,120}?([0-9]{1,3}(?:[,'’][0-9]{3})+|\d{1,7}).{0,80}?deal.{0,160}?(?:value|valued?).{0,120}?([0-9]+(?:\.[0-9]+)?)\s*(trillion|billion|bil\.|million)?\s*(USD|EUR)",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class _CacheEntry:
     value: Dict[str, Any]
     expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 
 _CACHE: Dict[str, _CacheEntry] = {}
@@ -28,20 +43,44 @@ def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     return e.value
 
 
-def _set_cached(key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
-    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+def _set_cached(
+    key: str,
+    value: Dict[str, Any],
+    ttl_seconds: int,
+    *,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds, etag=etag, last_modified=last_modified)
+
 
+def _fetch_html(url: str, prev: Optional[_CacheEntry] = None) -> Optional[tuple[str, Optional[str], Optional[str]]]:
+    """Return (html, etag, last_modified), or None when ``prev`` is still current (304 Not Modified).
 
-def _fetch_html(url: str) -> str:
-    req = Request(url, headers={"User-Agent": "GTA dashboard"})
-    with urlopen(req, timeout=15) as resp:
-        return resp.read().decode("utf-8", errors="ignore")
+    The IMAA pages change monthly, so revalidating the previous copy usually costs a 304
+    instead of re-downloading and re-parsing the page.
+    """
+    headers = {"User-Agent": "GTA dashboard"}
+    if prev is not None:
+        headers.update(conditional_headers(prev.etag, prev.last_modified))
+    fetched = urlopen_unless_not_modified(Request(url, headers=headers), timeout=15)
+    if fetched is None:
+        return None
+    body, etag, last_modified = fetched
+    return body.decode("utf-8", errors="ignore"), etag, last_modified
+
+
+def _revalidated(prev: Optional[_CacheEntry], ttl_seconds: int) -> Optional[Dict[str, Any]]:
+    if prev is None:
+        return None
+    prev.expires_at = time.time() + ttl_seconds
+    return {**prev.value, "cached": True, "revalidated": True}
 
 
 def _strip_tags(s: str) -> str:
-    s = re.sub(r"<[^>]+>", " ", s)
+    s = _RE_TAG.sub(" ", s)
     s = _html.unescape(s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_WS.sub(" ", s).strip()
     return s
 
 
@@ -56,18 +95,24 @@ def fetch_ma_by_industry(ttl_seconds: int = 24 * 60 * 60, force: bool = False) -
     if cached:
         return {**cached, "cached": True}
 
+    prev = _CACHE.get(key)
     try:
-        html = _fetch_html(IMAA_INDUSTRY_URL)
+        fetched = _fetch_html(IMAA_INDUSTRY_URL, prev)
     except Exception as e:
         payload = {"ok": False, "source": "IMAA", "link": IMAA_INDUSTRY_URL, "rows": [], "error": str(e)}
         _set_cached(key, payload, ttl_seconds)
         return {**payload, "cached": False}
+    if fetched is None:
+        revalidated = _revalidated(prev, ttl_seconds)
+        if revalidated is not None:
+            return revalidated
+    html, etag, last_modified = fetched or ("", None, None)
 
     rows: List[Dict[str, Any]] = []
 
     # Extract rows from the first HTML table.
-    for tr in re.findall(r"<tr[^>]*>(.*?)</tr>", html, re.IGNORECASE | re.DOTALL):
-        tds = re.findall(r"<td[^>]*>(.*?)</td>", tr, re.IGNORECASE | re.DOTALL)
+    for tr in _RE_TR.findall(html):
+        tds = _RE_TD.findall(tr)
         if len(tds) < 4:
             continue
 
@@ -106,7 +151,7 @@ def fetch_ma_by_industry(ttl_seconds: int = 24 * 60 * 60, force: bool = False) -
         "rows": rows,
         "note": "Parsed from public IMAA table (best-effort).",
     }
-    _set_cached(key, payload, ttl_seconds)
+    _set_cached(key, payload, ttl_seconds, etag=etag, last_modified=last_modified)
     return {**payload, "cached": False}
 
 
@@ -122,16 +167,22 @@ def fetch_ma_by_country(ttl_seconds: int = 24 * 60 * 60, force: bool = False) ->
     if cached:
         return {**cached, "cached": True}
 
+    prev = _CACHE.get(key)
     try:
-        html = _fetch_html(IMAA_COUNTRY_URL)
+        fetched = _fetch_html(IMAA_COUNTRY_URL, prev)
     except Exception as e:
         payload = {"ok": False, "source": "IMAA", "link": IMAA_COUNTRY_URL, "rows": [], "error": str(e)}
         _set_cached(key, payload, ttl_seconds)
         return {**payload, "cached": False}
+    if fetched is None:
+        revalidated = _revalidated(prev, ttl_seconds)
+        if revalidated is not None:
+            return revalidated
+    html, etag, last_modified = fetched or ("", None, None)
 
     # Preserve some structure by inserting markers for headings.
     # Elementor headings appear as <h2> / <h3> with text like "M&A Australia".
-    headings = list(re.finditer(r"<h[23][^>]*>\s*(M&amp;A|M&A)\s+([^<]+)</h[23]>", html, re.IGNORECASE))
+    headings = list(_RE_COUNTRY_HEADING.finditer(html))
 
     rows: List[Dict[str, Any]] = []
 
@@ -141,12 +192,13 @@ def fetch_ma_by_country(ttl_seconds: int = 24 * 60 * 60, force: bool = False) ->
         end = headings[idx + 1].start() if idx + 1 < len(headings) else start + 8000
         chunk = _strip_tags(html[start:end])
 
-        # Look for sentence with deals + value in USD/EUR.
-        m = re.search(
-            r"Since\s+(\d{4}).{0,120}?([0-9]{1,3}(?:[,'’][0-9]{3})+|\d{1,7}).{0,80}?deal.{0,160}?(?:value|valued?).{0,120}?([0-9]+(?:\.[0-9]+)?)\s*(trillion|billion|bil\.|million)?\s*(USD|EUR)",
-            chunk,
-            re.IGNORECASE,
-        )
+        # Look for sentence with deals + value in USD/EUR. The pattern's bounded lazy gaps
+        # backtrack heavily on sections that cannot match, so first check for the literals
+        # every match contains.
+        lowered = chunk.lower()
+        if "since" not in lowered or "deal" not in lowered or ("usd" not in lowered and "eur" not in lowered):
+            continue
+        m = _RE_COUNTRY_TOTALS.search(chunk)
         if not m:
             continue
 
@@ -194,5 +246,5 @@ def fetch_ma_by_country(ttl_seconds: int = 24 * 60 * 60, force: bool = False) ->
         ],
     }
 
-    _set_cached(key, payload, ttl_seconds)
+    _set_cached(key, payload, ttl_seconds, etag=etag, last_modified=last_modified)
     return {**payload, "cached": False}
@@ -1,26 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from urllib.parse import quote
 
+import jinja2
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.db.models import AppUser, GeoDictionary, JobRun, UserVisitLog, WidgetInsight, WidgetSnapshot
+from app.db.models import AppUser, GeoDictionary, WidgetInsight, WidgetSnapshot
 from app.db.session import get_db
 from app.jobs.runtime import (
     ALLOWED_GEOS,
     ALLOWED_INSIGHT_CARD_KEYS,
     ALLOWED_INSIGHT_TAB_KEYS,
+    data_version,
     get_allowed_geos,
     get_latest_snapshot,
     get_latest_snapshots_by_key,
+    get_latest_snapshots_for_keys,
     get_next_run_time,
     list_job_definitions,
     list_recent_job_runs,
@@ -28,12 +32,22 @@ from app.jobs.runtime import (
     run_job_now,
     update_job_definition,
 )
-from app.web import widget_data
+from app.web import visits, widget_data
 from app.web.auth import create_session_token, decode_session_token, get_password_hash, verify_password
 from app.web.schemas import UserInSession
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
+# uvicorn --reload only watches *.py, so template edits are picked up by Jinja's own
+# per-render stat(); production disables that via TEMPLATE_AUTO_RELOAD=false.
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader("app/web/templates"),
+        autoescape=True,
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+    )
+)
+
+_BASE_PATH = settings.BASE_PATH.rstrip("/")
 
 SESSION_COOKIE_NAME = "gta_session"
 VISIT_COOKIE_NAME = "gta_visit"
@@ -74,7 +88,7 @@ def _get_current_user_from_request(request: Request, db: Session | None = None)
 
 
 def _login_redirect_url(request: Request) -> str:
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     use_prefixed = bool(base) and request.url.path.startswith(f"{base}/")
     return f"{base}/login" if use_prefixed else "/login"
 
@@ -132,7 +146,7 @@ def _snapshot_payload(snapshot: WidgetSnapshot | None, fallback: dict | None = N
 
 
 def _jobs_redirect_url(request: Request, msg: str) -> str:
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     use_prefixed = bool(base) and request.url.path.startswith(f"{base}/")
     path = f"{base}/jobs" if use_prefixed else "/jobs"
     return f"{path}?msg={quote(msg)}"
@@ -140,9 +154,22 @@ def _jobs_redirect_url(request: Request, msg: str) -> str:
 
 def _latest_insights_map(db: Session) -> dict:
     """Return latest LLM insights keyed by (card_key, tab_key, scope)."""
-    rows: list[WidgetInsight] = (
-        db.query(WidgetInsight)
+    # DISTINCT ON keeps only the newest row per (card, tab, scope) server-side instead of
+    # loading the whole insight history and discarding all but the first in Python.
+    # Only the columns rendered on the page: skips llm_prompt (the full prompt text) and the
+    # other provenance columns, and returns light rows instead of hydrated ORM instances.
+    rows = (
+        db.query(
+            WidgetInsight.card_key,
+            WidgetInsight.tab_key,
+            WidgetInsight.scope,
+            WidgetInsight.content,
+            WidgetInsight.reference_list,
+            WidgetInsight.source_updated_at,
+            WidgetInsight.created_at,
+        )
         .filter(WidgetInsight.generated_by == "llm")
+        .distinct(WidgetInsight.card_key, WidgetInsight.tab_key, WidgetInsight.scope)
         .order_by(WidgetInsight.card_key.asc(), WidgetInsight.tab_key.asc(), WidgetInsight.scope.asc(), WidgetInsight.id.desc())
         .all()
     )
@@ -164,14 +191,47 @@ def _latest_insights_map(db: Session) -> dict:
     return out
 
 
+_DASHBOARD_WIDGET_KEYS = (
+    "trade_corridors",
+    "trade_exim_5y",
+    "wealth_indicators_5y",
+    "wealth_disposable_latest",
+    "wealth_age_structure_latest",
+    "finance_ma_industry",
+    "finance_ma_country",
+)
+
+
+# Built dashboard payload, reused until a job run commits new data (data_version changes)
+# or the TTL passes (covers writes made outside this process).
+_DASHBOARD_CACHE_TTL_SECONDS = 60.0
+_dashboard_cache: tuple[int, float, tuple[dict, datetime | None, bool]] | None = None
+
+
 def _dashboard_payload(db: Session) -> tuple[dict, datetime | None, bool]:
-    trade = get_latest_snapshot(db, "trade_corridors", "Global")
-    trade_exim = get_latest_snapshots_by_key(db, "trade_exim_5y")
-    wealth_ind = get_latest_snapshots_by_key(db, "wealth_indicators_5y")
-    wealth_disp = get_latest_snapshot(db, "wealth_disposable_latest", "Global")
-    wealth_age = get_latest_snapshots_by_key(db, "wealth_age_structure_latest")
-    fin_ind = get_latest_snapshot(db, "finance_ma_industry", "Global")
-    fin_cty = get_latest_snapshot(db, "finance_ma_country", "Global")
+    """Dashboard data shared by the page routes; callers must treat it as read-only."""
+    global _dashboard_cache
+    version = data_version()
+    now = time.monotonic()
+    cached = _dashboard_cache
+    if cached is not None and cached[0] == version and now - cached[1] < _DASHBOARD_CACHE_TTL_SECONDS:
+        return cached[2]
+    # The version is read before building, so a job committing mid-build forces a rebuild.
+    result = _build_dashboard_payload(db)
+    _dashboard_cache = (version, now, result)
+    return result
+
+
+def _build_dashboard_payload(db: Session) -> tuple[dict, datetime | None, bool]:
+    # One DISTINCT ON query for every widget on the page instead of one per widget.
+    latest = get_latest_snapshots_for_keys(db, list(_DASHBOARD_WIDGET_KEYS))
+    trade = latest["trade_corridors"].get("Global")
+    trade_exim = latest["trade_exim_5y"]
+    wealth_ind = latest["wealth_indicators_5y"]
+    wealth_disp = latest["wealth_disposable_latest"].get("Global")
+    wealth_age = latest["wealth_age_structure_latest"]
+    fin_ind = latest["finance_ma_industry"].get("Global")
+    fin_cty = latest["finance_ma_country"].get("Global")
 
     trade_payload = _snapshot_payload(trade)
     corridor_geos = trade_payload.get("geos") if isinstance(trade_payload.get("geos"), list) else []
@@ -222,17 +282,16 @@ def homepage(request: Request, db: Session = Depends(get_db)):
 
     should_count, cookie_value = _should_count_visit(request)
     if should_count:
-        db.add(UserVisitLog(ip=ip, user_agent=ua))
-        db.commit()
+        visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     response = templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -271,19 +330,16 @@ def homepage_v2(request: Request, db: Session = Depends(get_db)):
     # Still record visit for consistency.
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
     # Reuse dashboard snapshot freshness to display a consistent "Data updated at".
-    _, latest_at, _ = _dashboard_payload(db)
-
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v2.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "dashboard_data": dashboard_data,
             "data_updated_at": _fmt_utc(latest_at),
             "data_is_stale": is_stale,
@@ -301,17 +357,16 @@ def homepage_v3(request: Request, db: Session = Depends(get_db)):
     """
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v3.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -331,17 +386,16 @@ def homepage_v4(request: Request, db: Session = Depends(get_db)):
     """
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v4.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -356,17 +410,16 @@ def homepage_v4(request: Request, db: Session = Depends(get_db)):
 def homepage_v5(request: Request, db: Session = Depends(get_db)):
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v5.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -381,17 +434,16 @@ def homepage_v5(request: Request, db: Session = Depends(get_db)):
 def homepage_v5_1(request: Request, db: Session = Depends(get_db)):
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v5_1.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -406,17 +458,16 @@ def homepage_v5_1(request: Request, db: Session = Depends(get_db)):
 def homepage_v5_2(request: Request, db: Session = Depends(get_db)):
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v5_2.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -431,17 +482,16 @@ def homepage_v5_2(request: Request, db: Session = Depends(get_db)):
 def homepage_v5_3(request: Request, db: Session = Depends(get_db)):
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v5_3.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -456,17 +506,16 @@ def homepage_v5_3(request: Request, db: Session = Depends(get_db)):
 def homepage_v6(request: Request, db: Session = Depends(get_db)):
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
-    visited_count = db.query(func.count(UserVisitLog.id)).scalar() or 0
+    visited_count = visits.visited_count(db)
     dashboard_data, latest_at, is_stale = _dashboard_payload(db)
 
     return templates.TemplateResponse(
         "dashboard_v6.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "visited_count": visited_count,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "dashboard_data": dashboard_data,
@@ -482,8 +531,7 @@ def homepage_v7(request: Request, db: Session = Depends(get_db)):
     """v7 homepage — serves the static t7.html infographic page."""
     ip = _client_ip(request)
     ua = request.headers.get("user-agent", "")[:512]
-    db.add(UserVisitLog(ip=ip, user_agent=ua))
-    db.commit()
+    visits.record_visit(ip, ua)
 
     return FileResponse("app/web/static/t7.html", media_type="text/html")
 
@@ -505,11 +553,13 @@ def api_trade_corridors(db: Session = Depends(get_db)):
 
 
 @router.post("/api/trade/refresh")
-def api_trade_refresh():
-    results = [
-        run_job_now("trade_corridors", {"force_wci": True}, triggered_by="api"),
-        run_job_now("trade_exim_5y", {"force": True}, triggered_by="api"),
-    ]
+async def api_trade_refresh():
+    # Independent jobs with their own locks and sessions: run them side by side in worker
+    # threads so the refresh takes as long as the slower one rather than the sum.
+    results = await asyncio.gather(
+        asyncio.to_thread(run_job_now, "trade_corridors", {"force_wci": True}, "api"),
+        asyncio.to_thread(run_job_now, "trade_exim_5y", {"force": True}, "api"),
+    )
     return {
         "ok": all(x.get("ok") for x in results),
         "refreshed_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
@@ -582,7 +632,7 @@ def trade_flow_map(request: Request, db: Session = Depends(get_db)):
         "trade_flow_map.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "mode": "all",
             "mode_label": "ALL SCOPES",
@@ -600,7 +650,7 @@ def trade_flow_map_top5(request: Request, db: Session = Depends(get_db)):
         "trade_flow_map.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
             "mode": "top5",
             "mode_label": "TOP 5",
@@ -712,13 +762,13 @@ def jobs_page(request: Request, msg: str = "", db: Session = Depends(get_db)):
             }
         )
 
-    runs: list[JobRun] = list_recent_job_runs(db, limit=120)
+    runs = list_recent_job_runs(db, limit=120)
 
     return templates.TemplateResponse(
         "jobs.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "msg": msg,
             "jobs_enabled": settings.JOBS_ENABLED,
             "jobs": jobs,
@@ -779,7 +829,7 @@ def login_page(request: Request, error: str = "", message: str = ""):
         "login.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "error": error,
             "message": message,
         },
@@ -798,13 +848,13 @@ def login_submit(
 
     if not user or not verify_password(password, user.password_hash):
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/login?error=Invalid email or password",
+            url=f"{_BASE_PATH}/login?error=Invalid email or password",
             status_code=303,
         )
 
     if not user.is_active:
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/login?error=Account not activated. Please contact administrator.",
+            url=f"{_BASE_PATH}/login?error=Account not activated. Please contact administrator.",
             status_code=303,
         )
 
@@ -813,7 +863,7 @@ def login_submit(
 
     token = create_session_token(user.id)
 
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     redirect_url = f"{base}/jobs" if base else "/jobs"
 
     response = RedirectResponse(url=redirect_url, status_code=303)
@@ -831,7 +881,7 @@ def login_submit(
 
 @router.get("/logout")
 def logout(request: Request):
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     redirect_url = base or "/"
     response = RedirectResponse(url=redirect_url, status_code=303)
     response.delete_cookie(key=SESSION_COOKIE_NAME)
@@ -844,7 +894,7 @@ def register_page(request: Request, error: str = "", email: str = "", display_na
         "register.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "error": error,
             "email": email,
             "display_name": display_name,
@@ -866,27 +916,27 @@ def register_submit(
 
     if password != password_confirm:
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/register?error=Passwords do not match&email={email}&display_name={display_name or ''}",
+            url=f"{_BASE_PATH}/register?error=Passwords do not match&email={email}&display_name={display_name or ''}",
             status_code=303,
         )
 
     if len(password) < 8:
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/register?error=Password must be at least 8 characters&email={email}&display_name={display_name or ''}",
+            url=f"{_BASE_PATH}/register?error=Password must be at least 8 characters&email={email}&display_name={display_name or ''}",
             status_code=303,
         )
 
     import re
     if not re.search(r"[A-Za-z]", password) or not re.search(r"\d", password):
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/register?error=Password must contain at least one letter and one number&email={email}&display_name={display_name or ''}",
+            url=f"{_BASE_PATH}/register?error=Password must contain at least one letter and one number&email={email}&display_name={display_name or ''}",
             status_code=303,
         )
 
     existing = db.query(AppUser).filter(AppUser.email == email).first()
     if existing:
         return RedirectResponse(
-            url=f"{settings.BASE_PATH.rstrip('/')}/register?error=Email already registered&email={email}&display_name={display_name or ''}",
+            url=f"{_BASE_PATH}/register?error=Email already registered&email={email}&display_name={display_name or ''}",
             status_code=303,
         )
 
@@ -903,7 +953,7 @@ def register_submit(
     db.commit()
 
     return RedirectResponse(
-        url=f"{settings.BASE_PATH.rstrip('/')}/login?message=Registration successful. Please wait for administrator activation.",
+        url=f"{_BASE_PATH}/login?message=Registration successful. Please wait for administrator activation.",
         status_code=303,
     )
 
@@ -912,7 +962,7 @@ def register_submit(
 
 
 def _geos_redirect_url(request: Request, msg: str) -> str:
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     use_prefixed = bool(base) and request.url.path.startswith(f"{base}/")
     path = f"{base}/geos" if use_prefixed else "/geos"
     return f"{path}?msg={quote(msg)}"
@@ -933,7 +983,7 @@ def geos_page(request: Request, msg: str = "", db: Session = Depends(get_db)):
         "geos.html",
         {
             "request": request,
-            "base_path": settings.BASE_PATH.rstrip("/"),
+            "base_path": _BASE_PATH,
             "msg": msg,
             "geos": rows,
             "now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
@@ -1021,7 +1071,7 @@ def geos_head():
 
 
 def _register_base_path_aliases() -> None:
-    base = settings.BASE_PATH.rstrip("/")
+    base = _BASE_PATH
     if not base or base == "/":
         return
 
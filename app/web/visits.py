@@ -0,0 +1,135 @@
+"""Visit logging off the request path.
+
+Page handlers used to INSERT + COMMIT a user_visit_log row before rendering, so every view
+waited on a database round-trip and fsync. record_visit() now only queues the row; a single
+writer thread inserts whatever has queued up in one executemany per commit, so bursts of
+views share a commit while a lone view is still written straight away.
+
+The visit total shown on the dashboards is kept here as well: seeded from the table once,
+then advanced per recorded visit instead of a COUNT(*) over the whole log on every page
+view. The app runs as a single uvicorn worker and nothing else writes or prunes
+user_visit_log, so the in-process total tracks the table.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.db.models import UserVisitLog
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_MAX_BATCH = 500
+_STOP = object()
+
+# Crawlers and uptime checkers are not visitors: they are neither logged nor counted.
+_BOT_RE = re.compile(r"bot|spider|crawl|monitor|healthcheck", re.IGNORECASE)
+
+_QUEUE: queue.SimpleQueue[Any] = queue.SimpleQueue()
+_WRITER: threading.Thread | None = None
+
+# _LOCK guards the counters below and is only held for in-memory updates, so a page view
+# never waits on the database. _SEED_LOCK serialises the writer's INSERT/COMMIT with the
+# one-time seeding COUNT(*): the count then sees either none or all of a batch, and a batch
+# leaves _unwritten before the next COUNT can run.
+_LOCK = threading.Lock()
+_SEED_LOCK = threading.Lock()
+_visit_count: int | None = None
+_unwritten = 0
+
+
+def record_visit(ip: str, user_agent: str) -> None:
+    global _unwritten, _visit_count
+    if _BOT_RE.search(user_agent):
+        return
+    with _LOCK:
+        _unwritten += 1
+        if _visit_count is not None:
+            _visit_count += 1
+    _QUEUE.put({"ip": ip, "user_agent": user_agent, "created_at": datetime.now(timezone.utc)})
+
+
+def visited_count(db: Session) -> int:
+    global _visit_count
+    with _LOCK:
+        if _visit_count is not None:
+            return _visit_count
+    with _SEED_LOCK:
+        with _LOCK:
+            if _visit_count is not None:
+                return _visit_count
+        written = db.query(func.count(UserVisitLog.id)).scalar() or 0
+        with _LOCK:
+            # Visits recorded while counting are still unwritten (the writer is blocked on
+            # _SEED_LOCK), so they are picked up here rather than double counted.
+            _visit_count = written + _unwritten
+            return _visit_count
+
+
+def _write_batch(rows: list[dict[str, Any]]) -> None:
+    global _unwritten, _visit_count
+    db = SessionLocal()
+    try:
+        with _SEED_LOCK:
+            try:
+                db.execute(insert(UserVisitLog), rows)
+                db.commit()
+                failed = False
+            except Exception:  # noqa: BLE001
+                db.rollback()
+                failed = True
+                logger.exception("visit log write failed; dropped %d row(s)", len(rows))
+            with _LOCK:
+                _unwritten -= len(rows)
+                if failed and _visit_count is not None:
+                    _visit_count -= len(rows)
+    finally:
+        db.close()
+
+
+def _writer_loop() -> None:
+    stopping = False
+    while not stopping:
+        item = _QUEUE.get()
+        rows: list[dict[str, Any]] = []
+        while True:
+            if item is _STOP:
+                stopping = True
+            else:
+                rows.append(item)
+            if stopping or len(rows) >= _MAX_BATCH:
+                break
+            try:
+                item = _QUEUE.get_nowait()
+            except queue.Empty:
+                break
+        if rows:
+            _write_batch(rows)
+
+
+def start_visit_writer() -> None:
+    global _WRITER
+    if _WRITER is not None and _WRITER.is_alive():
+        return
+    _WRITER = threading.Thread(target=_writer_loop, name="visit-log-writer", daemon=True)
+    _WRITER.start()
+
+
+def stop_visit_writer(timeout: float = 5.0) -> None:
+    """Flush queued visits and stop the writer thread."""
+    global _WRITER
+    writer = _WRITER
+    if writer is None:
+        return
+    _QUEUE.put(_STOP)
+    writer.join(timeout)
+    _WRITER = None
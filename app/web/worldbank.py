@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+# Per-geo jobs make several WDI calls to the same host; reuse keep-alive connections.
+from app.http_pool import urlopen
 
 
 @dataclass
@@ -14,18 +19,32 @@ class _CacheEntry:
     expires_at: float
 
 
-_CACHE: Dict[str, _CacheEntry] = {}
+# Keys vary with country, indicator and year window, so the cache is bounded: the least
+# recently used entry is evicted past _MAX_ENTRIES and expired entries are dropped on lookup.
+# Jobs fetch from worker threads, hence the lock.
+_MAX_ENTRIES = 256
+_CACHE: OrderedDict[str, _CacheEntry] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
 
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
-    e = _CACHE.get(key)
-    if not e or time.time() >= e.expires_at:
-        return None
-    return e.value
+    with _CACHE_LOCK:
+        e = _CACHE.get(key)
+        if not e:
+            return None
+        if time.time() >= e.expires_at:
+            del _CACHE[key]
+            return None
+        _CACHE.move_to_end(key)
+        return e.value
 
 
 def _set_cached(key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
-    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+    with _CACHE_LOCK:
+        _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _MAX_ENTRIES:
+            _CACHE.popitem(last=False)
 
 
 def fetch_wdi_indicator(
@@ -131,12 +150,15 @@ def fetch_trade_exim_5y(
     imp_map = {p["period"]: p.get("value") for p in imp.get("series", [])}
 
     series = []
+    latest_idx = None  # index of the latest period with an export or import value
     for per in periods:
         e = exp_map.get(per)
         i = imp_map.get(per)
         bal = None
         if e is not None and i is not None:
             bal = e - i
+        if e is not None or i is not None:
+            latest_idx = len(series)
         series.append({"period": per, "export_usd": e, "import_usd": i, "balance_usd": bal})
 
     return {
@@ -147,6 +169,7 @@ def fetch_trade_exim_5y(
         "ok": bool(exp.get("ok")) and bool(imp.get("ok")),
         "errors": [x for x in [exp.get("error"), imp.get("error")] if x],
         "series": series,
+        "latest_idx": latest_idx,
     }
 
 
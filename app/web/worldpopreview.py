@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+# The per-country WDI loop makes one call per geo to the same host; reuse keep-alive connections.
+from app.http_pool import urlopen
 
 
 @dataclass
@@ -13,18 +18,32 @@ class _CacheEntry:
     expires_at: float
 
 
-_CACHE: Dict[str, _CacheEntry] = {}
+# Keys vary with the indicator and country set, so the cache is bounded: the least
+# recently used entry is evicted past _MAX_ENTRIES and expired entries are dropped on lookup.
+# Jobs fetch from worker threads, hence the lock.
+_MAX_ENTRIES = 64
+_CACHE: OrderedDict[str, _CacheEntry] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
 
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
-    e = _CACHE.get(key)
-    if not e or time.time() >= e.expires_at:
-        return None
-    return e.value
+    with _CACHE_LOCK:
+        e = _CACHE.get(key)
+        if not e:
+            return None
+        if time.time() >= e.expires_at:
+            del _CACHE[key]
+            return None
+        _CACHE.move_to_end(key)
+        return e.value
 
 
 def _set_cached(key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
-    _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+    with _CACHE_LOCK:
+        _CACHE[key] = _CacheEntry(value=value, expires_at=time.time() + ttl_seconds)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _MAX_ENTRIES:
+            _CACHE.popitem(last=False)
 
 
 def _to_number(s: str) -> Optional[float]:
@@ -170,6 +170,15 @@ CREATE INDEX IF NOT EXISTS idx_widget_snapshots_lookup
 CREATE INDEX IF NOT EXISTS idx_widget_snapshots_fetched_at
     ON public.widget_snapshots(fetched_at);
 
+-- Retention cleanup deletes job_runs by started_at cutoff in batches.
+CREATE INDEX IF NOT EXISTS idx_job_runs_started_at
+    ON public.job_runs(started_at);
+
+-- job_run_id FKs are ON DELETE SET NULL: each deleted job_run looks up its referencing
+-- rows by job_run_id, which is a full scan of the referencing table without an index.
+CREATE INDEX IF NOT EXISTS idx_widget_snapshots_job_run_id
+    ON public.widget_snapshots(job_run_id);
+
 -- Geo dictionary: DB-driven list of geos used by jobs and dashboard.
 CREATE TABLE IF NOT EXISTS public.geo_dictionary (
     geo_name VARCHAR(80) PRIMARY KEY,
@@ -367,6 +376,14 @@ CREATE INDEX IF NOT EXISTS idx_widget_insights_lookup
 CREATE INDEX IF NOT EXISTS idx_widget_insights_digest
     ON public.widget_insights(card_key, tab_key, scope, lang, data_digest);
 
+CREATE INDEX IF NOT EXISTS idx_widget_insights_job_run_id
+    ON public.widget_insights(job_run_id);
+
+-- Dashboard reads the newest LLM insight per (card, tab, scope) with DISTINCT ON ... id DESC.
+CREATE INDEX IF NOT EXISTS idx_widget_insights_latest_llm
+    ON public.widget_insights(card_key, tab_key, scope, id DESC)
+    WHERE generated_by = 'llm';
+
 -- Detailed per-attempt logs for LLM Insight generation.
 CREATE TABLE IF NOT EXISTS public.insight_generate_logs (
     id BIGSERIAL PRIMARY KEY,
@@ -411,6 +428,9 @@ ALTER TABLE IF EXISTS public.insight_generate_logs ALTER COLUMN error TYPE TEXT;
 CREATE INDEX IF NOT EXISTS idx_widget_commentaries_lookup
     ON public.widget_commentaries(widget_key, scope, lang, created_at DESC);
 
+CREATE INDEX IF NOT EXISTS idx_widget_commentaries_job_run_id
+    ON public.widget_commentaries(job_run_id);
+
 CREATE OR REPLACE FUNCTION public.set_updated_at()
 RETURNS TRIGGER AS $$
 BEGIN